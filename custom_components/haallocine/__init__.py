@@ -6,15 +6,25 @@ from dataclasses import dataclass
 import logging
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CONF_THEATERS, DOMAIN, SIGNAL_UNLOADED
 from .coordinator import AllocineCoordinator
 from .services import AllocineServicesSetup
+from .showtimes import ShowtimesCoordinator
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS: list[Platform] = [Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type MyConfigEntry = ConfigEntry[RuntimeData]
 
 
@@ -23,6 +33,13 @@ class RuntimeData:
     """Class to hold runtime data."""
 
     coordinator: AllocineCoordinator
+    showtimes: ShowtimesCoordinator | None = None
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up HAAllocine (registered once, whatever the config entries)."""
+    async_register_websocket_commands(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
@@ -32,14 +49,47 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     # Initialize coordinator
     coordinator = AllocineCoordinator(hass, config_entry)
 
-    # Perform first refresh
-    await coordinator.async_config_entry_first_refresh()
+    # Serve saved releases if any, only block on a scrape when there are none
+    if not await coordinator.async_restore():
+        await coordinator.async_config_entry_first_refresh()
+    elif coordinator.outdated:
+        # Last week's releases are served until this week's are fetched
+        config_entry.async_create_background_task(
+            hass, coordinator.async_catch_up(), f"{DOMAIN} catch up"
+        )
 
     if not coordinator.data:
         raise ConfigEntryNotReady("Failed to fetch initial data from Allocine")
 
+    # Search over the archive isn't needed to serve posters - build it in the background
+    config_entry.async_create_background_task(
+        hass, coordinator.async_load_search_index(), f"{DOMAIN} search index"
+    )
+
+    # Showtimes are optional - only fetched when theaters are configured
+    showtimes = None
+    if theaters := config_entry.options.get(CONF_THEATERS):
+        showtimes = ShowtimesCoordinator(
+            hass, config_entry, coordinator.api, theaters
+        )
+        # Keep the hourly check running even without entities listening
+        config_entry.async_on_unload(showtimes.async_add_listener(lambda: None))
+        # Don't block setup on showtimes, they are fetched in the background
+        config_entry.async_create_background_task(
+            hass, showtimes.async_refresh(), f"{DOMAIN} showtimes refresh"
+        )
+
     # Store in runtime data
-    config_entry.runtime_data = RuntimeData(coordinator=coordinator)
+    config_entry.runtime_data = RuntimeData(
+        coordinator=coordinator, showtimes=showtimes
+    )
+
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+    # Reload when theaters are changed in the options
+    config_entry.async_on_unload(
+        config_entry.add_update_listener(_async_update_listener)
+    )
 
     # Setup services
     AllocineServicesSetup(hass)
@@ -55,12 +105,26 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -
     """Unload integration and clean up resources."""
     _LOGGER.info("Unloading HAAllocine integration")
 
+    if not await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS):
+        return False
+
+    # Subscribers listen to this coordinator - tell them to resubscribe
+    async_dispatcher_send(hass, SIGNAL_UNLOADED)
+
     # Shutdown coordinator (cancel scheduled updates)
     coordinator = config_entry.runtime_data.coordinator
     await coordinator.async_shutdown()
+    if showtimes := config_entry.runtime_data.showtimes:
+        await showtimes.async_shutdown()
 
     # Remove services
     for service in hass.services.async_services_for_domain(DOMAIN):
         hass.services.async_remove(DOMAIN, service)
 
     return True
+
+
+async def _async_update_listener(hass: HomeAssistant, config_entry: MyConfigEntry) -> None:
+    """Reload integration when options are updated."""
+    _LOGGER.debug("Options updated, reloading HAAllocine")
+    await hass.config_entries.async_reload(config_entry.entry_id)
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 import json
 import logging
+import os
 from pathlib import Path
 import re
-from typing import Any
+import shutil
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
 
 import requests
-from bs4 import BeautifulSoup
+
+if TYPE_CHECKING:
+    from .placeholder import PosterPlaceholder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,28 +31,61 @@ class AllocineMovie:
     release_date: str
     want_to_see_count: int = 0
     local_poster_path: str | None = None
+    genres: list[str] = field(default_factory=list)
+    placeholder: PosterPlaceholder | None = None
+
+
+@dataclass
+class AllocineShowtime:
+    """Represents a single showing of a movie in a theater."""
+
+    theater_id: str
+    movie_id: str
+    movie_title: str
+    starts_at: datetime
+    version: str = ""
+
+
+def release_week(release_date: str) -> date | None:
+    """Return the Wednesday starting the release week of a date."""
+    try:
+        day = date.fromisoformat(release_date[:10])
+    except ValueError:
+        return None
+
+    # French releases happen on Wednesdays (weekday 2)
+    return day - timedelta(days=(day.weekday() - 2) % 7)
 
 
 class AllocineAPI:
     """API for scraping Allocine.fr."""
 
     WEEKLY_URL = "https://www.allocine.fr/film/sorties-semaine/"
+    UPCOMING_URL = "https://www.allocine.fr/film/agenda/sem-{week}/"
+    SHOWTIMES_URL = "https://www.allocine.fr/_/showtimes/theater-{theater_id}/d-{day}/p-{page}/"
+
+    # Showtimes are published in French local time without an offset
+    TIMEZONE = ZoneInfo("Europe/Paris")
 
     def __init__(self, cache_dir: Path) -> None:
         """Initialize API with cache directory."""
+        # Directory is created on first download, from the executor
         self.cache_dir = cache_dir
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Releases are downloaded here first, then promoted to the live cache
+        self.staging_root = cache_dir / "staging"
         _LOGGER.debug("AllocineAPI initialized with cache dir: %s", self.cache_dir)
 
-    def scrape_weekly_releases(self) -> list[AllocineMovie]:
-        """Scrape current week's movie releases (blocking operation)."""
-        _LOGGER.info("Starting scrape of Allocine weekly releases")
+    def scrape_weekly_releases(
+        self, week: date | None = None, target_dir: Path | None = None
+    ) -> list[AllocineMovie]:
+        """Scrape a week's movie releases, the current one by default (blocking operation)."""
+        url = self.WEEKLY_URL if week is None else self.UPCOMING_URL.format(week=week.isoformat())
+        _LOGGER.info("Starting scrape of Allocine weekly releases from %s", url)
+
         try:
-            response = requests.get(self.WEEKLY_URL, timeout=30)
+            response = requests.get(url, timeout=30)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
-
             # Extract jsEntities variable from script tags
             js_entities = self._extract_js_entities(response.text)
 
@@ -64,7 +103,7 @@ class AllocineAPI:
                 _LOGGER.info("  #%d: %s (%d want to see)", i, movie.title, movie.want_to_see_count)
 
             # Download poster images for top 3
-            self._download_posters(top_movies)
+            self._download_posters(top_movies, target_dir or self.cache_dir)
 
             return top_movies
 
@@ -151,6 +190,9 @@ class AllocineAPI:
         # Extract want to see count
         want_to_see_count = movie_data.get("social", {}).get("user_note_i_want_to_see_count", 0)
 
+        # Extract genres
+        genres = self._extract_genres(movie_data)
+
         if not movie_id or not poster_url:
             _LOGGER.debug(
                 "Skipping movie '%s': missing ID or poster URL", title
@@ -165,6 +207,7 @@ class AllocineAPI:
             poster_url=poster_url,
             release_date=release_date,
             want_to_see_count=want_to_see_count,
+            genres=genres,
         )
 
     def _extract_poster_url(self, movie_data: dict[str, Any]) -> str:
@@ -178,9 +221,23 @@ class AllocineAPI:
 
         return ""
 
-    def _download_posters(self, movies: list[AllocineMovie]) -> None:
-        """Download poster images to cache (blocking operation)."""
-        _LOGGER.info("Downloading %d posters to cache", len(movies))
+    def _extract_genres(self, movie_data: dict[str, Any]) -> list[str]:
+        """Extract genre names from movie data."""
+        # Genres are either plain names or dicts with a translated label
+        genres = []
+        for genre in movie_data.get("genres") or []:
+            if isinstance(genre, dict):
+                genre = genre.get("translate") or genre.get("name") or ""
+            if isinstance(genre, str) and genre.strip():
+                genres.append(genre.strip())
+
+        return genres
+
+    def _download_posters(self, movies: list[AllocineMovie], target_dir: Path) -> None:
+        """Download poster images to a directory (blocking operation)."""
+        _LOGGER.info("Downloading %d posters to %s", len(movies), target_dir)
+
+        target_dir.mkdir(parents=True, exist_ok=True)
 
         for rank, movie in enumerate(movies, 1):
             if not movie.poster_url:
@@ -189,7 +246,7 @@ class AllocineAPI:
 
             try:
                 # Use simple rank-based filename: 1.jpg, 2.jpg, 3.jpg
-                poster_path = self.cache_dir / f"{rank}.jpg"
+                poster_path = target_dir / f"{rank}.jpg"
 
                 _LOGGER.debug("Downloading poster #%d for %s from %s", rank, movie.title, movie.poster_url)
 
@@ -212,18 +269,130 @@ class AllocineAPI:
                 )
                 # Don't fail entire update for one poster
 
-    def clear_cache(self) -> None:
-        """Clear all cached poster images."""
-        _LOGGER.info("Clearing poster cache at %s", self.cache_dir)
-        count = 0
-        for poster in self.cache_dir.glob("*.jpg"):
+    def fetch_theater_showtimes(
+        self, theater_id: str, day: date
+    ) -> list[AllocineShowtime]:
+        """Fetch all showtimes of a theater for a given day (blocking operation)."""
+        _LOGGER.debug("Fetching showtimes for theater %s on %s", theater_id, day)
+
+        showtimes: list[AllocineShowtime] = []
+        page = 1
+        total_pages = 1
+
+        try:
+            while page <= total_pages:
+                response = requests.get(
+                    self.SHOWTIMES_URL.format(
+                        theater_id=theater_id, day=day.isoformat(), page=page
+                    ),
+                    timeout=30,
+                )
+                response.raise_for_status()
+                payload = response.json()
+
+                for result in payload.get("results", []):
+                    showtimes.extend(self._parse_showtimes(theater_id, result))
+
+                total_pages = payload.get("pagination", {}).get("totalPages", 1) or 1
+                page += 1
+
+        except requests.RequestException as err:
+            _LOGGER.error("Failed to fetch showtimes for %s: %s", theater_id, err)
+            raise AllocineConnectionError(f"Connection error: {err}") from err
+        except (ValueError, AttributeError) as err:
+            _LOGGER.error("Failed to parse showtimes for %s: %s", theater_id, err)
+            raise AllocineParseError(f"Invalid showtimes data: {err}") from err
+
+        _LOGGER.debug(
+            "Found %d showtimes for theater %s on %s", len(showtimes), theater_id, day
+        )
+        return showtimes
+
+    def _parse_showtimes(
+        self, theater_id: str, result: dict[str, Any]
+    ) -> list[AllocineShowtime]:
+        """Parse the showtimes of one movie from a showtimes page result."""
+        movie = result.get("movie") or {}
+        movie_id = str(movie.get("internalId") or movie.get("id") or "")
+        title = movie.get("title", "Unknown")
+
+        if not movie_id:
+            _LOGGER.debug("Skipping showtimes for '%s': missing movie ID", title)
+            return []
+
+        showtimes = []
+        # Showtimes are grouped by version (original, dubbed, local, ...)
+        for version, entries in (result.get("showtimes") or {}).items():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                starts_at = entry.get("startsAt")
+                if not starts_at:
+                    continue
+                start = datetime.fromisoformat(starts_at)
+                if start.tzinfo is None:
+                    start = start.replace(tzinfo=self.TIMEZONE)
+                showtimes.append(
+                    AllocineShowtime(
+                        theater_id=theater_id,
+                        movie_id=movie_id,
+                        movie_title=title,
+                        starts_at=start,
+                        version=version,
+                    )
+                )
+
+        return showtimes
+
+    def staging_dir(self, week: date) -> Path:
+        """Return where the releases of a week are staged."""
+        return self.staging_root / week.isoformat()
+
+    def clear_staging(self, week: date) -> None:
+        """Remove what was staged for a week (blocking operation)."""
+        shutil.rmtree(self.staging_dir(week), ignore_errors=True)
+
+    def prune_staging(self, through: date) -> None:
+        """Remove staging areas of a week and the weeks before it (blocking operation)."""
+        if not self.staging_root.is_dir():
+            return
+        for directory in self.staging_root.iterdir():
+            if directory.name <= through.isoformat():
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def promote_staging(self, movies: list[AllocineMovie]) -> list[str | None]:
+        """Copy staged posters over the live ones, return their live paths (blocking operation)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        live_paths: list[str | None] = []
+        for rank, movie in enumerate(movies, 1):
+            if not movie.local_poster_path:
+                live_paths.append(None)
+                continue
+
+            target = self.cache_dir / f"{rank}.jpg"
+            partial = target.with_suffix(".part")
             try:
-                poster.unlink()
-                count += 1
-            except Exception as err:
-                _LOGGER.warning("Failed to delete %s: %s", poster, err)
+                shutil.copyfile(movie.local_poster_path, partial)
+                # Renaming is atomic, a poster is never served half-written
+                os.replace(partial, target)
+            except OSError as err:
+                # The live file is another movie's poster and the staged copy is
+                # removed once published, so the movie goes without a poster
+                _LOGGER.warning("Failed to promote poster for %s: %s", movie.title, err)
+                partial.unlink(missing_ok=True)
+                live_paths.append(None)
+                continue
+            live_paths.append(str(target))
+
+        # Posters of ranks the new releases don't fill anymore
+        kept = {path for path in live_paths if path}
+        for poster in self.cache_dir.glob("*.jpg"):
+            if str(poster) not in kept:
+                poster.unlink(missing_ok=True)
 
-        _LOGGER.info("Cleared %d cached posters", count)
+        _LOGGER.info("Promoted staged posters to %s, %d served", self.cache_dir, len(kept))
+        return live_paths
 
 
 class AllocineConnectionError(Exception):
@@ -0,0 +1,234 @@
+"""Local SQLite archive of past weekly releases."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import date
+import json
+import logging
+from pathlib import Path
+import shutil
+import sqlite3
+
+from .allocine_api import AllocineMovie
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    week TEXT NOT NULL,
+    movie_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    poster_url TEXT NOT NULL,
+    release_date TEXT NOT NULL,
+    want_to_see_count INTEGER NOT NULL DEFAULT 0,
+    genres TEXT NOT NULL DEFAULT '[]',
+    poster_path TEXT,
+    placeholder TEXT,
+    PRIMARY KEY (week, movie_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS releases_movie_id ON releases (movie_id);
+CREATE INDEX IF NOT EXISTS releases_popularity ON releases (want_to_see_count DESC);
+"""
+
+COLUMNS = (
+    "week, movie_id, rank, title, poster_url, release_date, "
+    "want_to_see_count, genres, poster_path, placeholder"
+)
+
+# Columns added after the first release, with their definition
+ADDED_COLUMNS = {"placeholder": "TEXT"}
+
+
+@dataclass
+class ArchivedRelease:
+    """A movie as it was released in a given week."""
+
+    week: str
+    rank: int
+    movie: AllocineMovie
+
+
+class AllocineArchive:
+    """Archive of weekly release snapshots (all methods are blocking)."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize archive in a directory (database and posters)."""
+        self.directory = directory
+        self.db_path = directory / "archive.db"
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection (executor jobs may run on any thread)."""
+        if not self._schema_ready:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        with closing(sqlite3.connect(self.db_path)) as connection:
+            if not self._schema_ready:
+                connection.executescript(SCHEMA)
+                self._migrate(connection)
+                self._schema_ready = True
+            yield connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Add columns missing from a database created by an older version."""
+        existing = {row[1] for row in connection.execute("PRAGMA table_info(releases)")}
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in existing:
+                _LOGGER.info("Adding column %s to the archive", column)
+                connection.execute(f"ALTER TABLE releases ADD COLUMN {column} {definition}")
+
+    def poster_path(self, week: str, movie_id: str) -> Path:
+        """Return where the poster of an archived movie is stored."""
+        return self.directory / week / f"{movie_id}.jpg"
+
+    def record_week(self, week: date, movies: list[AllocineMovie]) -> None:
+        """Append (or replace) the snapshot of a week, in a single transaction."""
+        week_key = week.isoformat()
+
+        # Drop posters of a previous snapshot of the same week
+        shutil.rmtree(self.directory / week_key, ignore_errors=True)
+
+        rows = []
+        for rank, movie in enumerate(movies, 1):
+            rows.append(
+                (
+                    week_key,
+                    movie.id,
+                    rank,
+                    movie.title,
+                    movie.poster_url,
+                    movie.release_date,
+                    movie.want_to_see_count,
+                    json.dumps(movie.genres),
+                    self._archive_poster(week_key, movie),
+                    json.dumps(movie.placeholder) if movie.placeholder else None,
+                )
+            )
+
+        with self._connect() as connection, connection:
+            # A refresh within the same week replaces that week's snapshot
+            connection.execute("DELETE FROM releases WHERE week = ?", (week_key,))
+            connection.executemany(
+                f"INSERT INTO releases ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+        _LOGGER.info("Archived %d movies for week of %s", len(rows), week_key)
+
+    def _archive_poster(self, week: str, movie: AllocineMovie) -> str | None:
+        """Copy a cached poster into the archive, the live cache is cleared weekly."""
+        if not movie.local_poster_path:
+            return None
+
+        target = self.poster_path(week, movie.id)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(movie.local_poster_path, target)
+        except OSError as err:
+            _LOGGER.warning("Failed to archive poster for %s: %s", movie.title, err)
+            return None
+
+        return str(target)
+
+    def weeks(self) -> list[str]:
+        """Return archived weeks, most recent first."""
+        with self._connect() as connection:
+            return [
+                week
+                for (week,) in connection.execute(
+                    "SELECT DISTINCT week FROM releases ORDER BY week DESC"
+                )
+            ]
+
+    def releases_for_week(self, week: str) -> list[ArchivedRelease]:
+        """Return the movies released in a week, by rank."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM releases WHERE week = ? ORDER BY rank",
+                (week,),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def releases_by_week(self, max_weeks: int | None = None) -> dict[str, list[ArchivedRelease]]:
+        """Return archived movies grouped by week, most recent first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM releases"
+                " WHERE week IN (SELECT DISTINCT week FROM releases"
+                " ORDER BY week DESC LIMIT ?)"
+                " ORDER BY week DESC, rank",
+                (-1 if max_weeks is None else max_weeks,),
+            ).fetchall()
+
+        releases: dict[str, list[ArchivedRelease]] = {}
+        for row in rows:
+            release = self._from_row(row)
+            releases.setdefault(release.week, []).append(release)
+        return releases
+
+    def top_releases(self, since: date, limit: int) -> list[ArchivedRelease]:
+        """Return the most anticipated movies released since a date."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM releases WHERE week >= ?"
+                " ORDER BY want_to_see_count DESC LIMIT ?",
+                (since.isoformat(), limit),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def prune(self, keep_weeks: int) -> list[str]:
+        """Delete all but the most recent weeks and their posters."""
+        with self._connect() as connection, connection:
+            old_weeks = [
+                week
+                for (week,) in connection.execute(
+                    "SELECT DISTINCT week FROM releases ORDER BY week DESC LIMIT -1 OFFSET ?",
+                    (keep_weeks,),
+                )
+            ]
+            connection.executemany(
+                "DELETE FROM releases WHERE week = ?", [(week,) for week in old_weeks]
+            )
+
+        for week in old_weeks:
+            shutil.rmtree(self.directory / week, ignore_errors=True)
+
+        if old_weeks:
+            _LOGGER.info("Pruned %d archived weeks: %s", len(old_weeks), old_weeks)
+        return old_weeks
+
+    @staticmethod
+    def _from_row(row: tuple) -> ArchivedRelease:
+        """Build an archived release from a database row."""
+        (
+            week,
+            movie_id,
+            rank,
+            title,
+            poster_url,
+            release_date,
+            want_to_see_count,
+            genres,
+            poster_path,
+            placeholder,
+        ) = row
+        return ArchivedRelease(
+            week=week,
+            rank=rank,
+            movie=AllocineMovie(
+                id=movie_id,
+                title=title,
+                poster_url=poster_url,
+                release_date=release_date,
+                want_to_see_count=want_to_see_count,
+                local_poster_path=poster_path,
+                genres=json.loads(genres),
+                placeholder=json.loads(placeholder) if placeholder else None,
+            ),
+        )
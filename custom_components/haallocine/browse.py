@@ -0,0 +1,339 @@
+"""Precomputed media browser tree for HAAllocine."""
+
+from __future__ import annotations
+
+import copy
+from datetime import date
+import logging
+from typing import Any
+from urllib.parse import parse_qs, urlencode
+
+from homeassistant.components.media_player import MediaClass, MediaType
+from homeassistant.components.media_source import BrowseMediaSource
+from homeassistant.util import slugify
+
+from .allocine_api import AllocineMovie, release_week
+from .archive import ArchivedRelease
+from .const import (
+    BROWSE_MAX_PAGE_SIZE,
+    BROWSE_PAGE_SIZE,
+    BROWSE_RANK_BUCKET_SIZE,
+    DOMAIN,
+)
+from .placeholder import PosterPlaceholder
+
+_LOGGER = logging.getLogger(__name__)
+
+ROOT_IDENTIFIER = ""
+WEEK_IDENTIFIER = "week"
+GENRE_IDENTIFIER = "genre"
+RANK_IDENTIFIER = "rank"
+ARCHIVE_IDENTIFIER = "archive"
+ARCHIVE_TOP_IDENTIFIER = "archive/top"
+SEARCH_IDENTIFIER = "search"
+SHOWTIMES_IDENTIFIER = "showtimes"
+
+ROOT_TITLE = "Allocine Weekly Releases"
+
+
+def parse_identifier(identifier: str | None) -> tuple[str, int, int]:
+    """Split an identifier into its node and paging (offset, limit)."""
+    node, _, query = (identifier or "").partition("?")
+    params = parse_qs(query)
+
+    try:
+        offset = max(int(params.get("offset", ["0"])[0]), 0)
+        limit = int(params.get("limit", [str(BROWSE_PAGE_SIZE)])[0])
+    except ValueError:
+        offset, limit = 0, BROWSE_PAGE_SIZE
+
+    return node, offset, min(max(limit, 1), BROWSE_MAX_PAGE_SIZE)
+
+
+def page_identifier(node: str, offset: int, limit: int) -> str:
+    """Build the identifier of a page of a node."""
+    if offset == 0 and limit == BROWSE_PAGE_SIZE:
+        return node
+    return f"{node}?{urlencode({'offset': offset, 'limit': limit})}"
+
+
+def poster_url(movie: AllocineMovie) -> str:
+    """Return the URL of a movie poster served by the HTTP view."""
+    return f"/api/haallocine/poster/{movie.id}.jpg"
+
+
+def archive_identifier(release: ArchivedRelease) -> str:
+    """Return the identifier of an archived movie."""
+    return f"{ARCHIVE_IDENTIFIER}/{release.week}/{release.movie.id}"
+
+
+def archive_poster_url(week: str, movie_id: str) -> str:
+    """Return the URL of an archived poster served by the HTTP view."""
+    return f"/api/haallocine/archive/{week}/{movie_id}.jpg"
+
+
+class PosterBrowseMedia(BrowseMediaSource):
+    """Poster node also listing its placeholder, painted before the image loads."""
+
+    def __init__(self, *, placeholder: PosterPlaceholder | None, **kwargs: Any) -> None:
+        """Initialize poster node."""
+        super().__init__(**kwargs)
+        self.placeholder = placeholder
+
+    def as_dict(self, *, parent: bool = True) -> dict[str, Any]:
+        """Add the placeholder to the browse media dictionary."""
+        response = super().as_dict(parent=parent)
+        if self.placeholder:
+            response["placeholder"] = self.placeholder
+        return response
+
+
+class BrowseTree:
+    """Browse nodes built once per version of the coordinator data."""
+
+    def __init__(
+        self,
+        version: int,
+        movies: list[AllocineMovie],
+        has_showtimes: bool = False,
+        archive: dict[str, list[ArchivedRelease]] | None = None,
+        archive_top: list[ArchivedRelease] | None = None,
+    ) -> None:
+        """Build every node of the tree and its first page."""
+        self.version = version
+        self.has_showtimes = has_showtimes
+
+        # node identifier -> (title, children)
+        self._nodes: dict[str, tuple[str, list[BrowseMediaSource]]] = {}
+        # canonical identifier (with paging) -> rendered node, see _is_canonical_page
+        self._pages: dict[str, BrowseMediaSource] = {}
+
+        self._build(movies)
+        self._build_archive(archive or {}, archive_top or [])
+
+        # First pages are what the media panel opens - render them upfront
+        for node in self._nodes:
+            self._pages[node] = self._render(node, 0, BROWSE_PAGE_SIZE)
+
+        _LOGGER.debug(
+            "Built browse tree v%d: %d nodes, %d movies",
+            version,
+            len(self._nodes),
+            len(movies),
+        )
+
+    def _build(self, movies: list[AllocineMovie]) -> None:
+        """Group movies by week, genre and rank bucket."""
+        movie_nodes = [self._movie_node(movie) for movie in movies]
+
+        weeks: dict[date, list[BrowseMediaSource]] = {}
+        genres: dict[str, tuple[str, list[BrowseMediaSource]]] = {}
+        for movie, node in zip(movies, movie_nodes, strict=True):
+            self._pages[movie.id] = node
+            if week := release_week(movie.release_date):
+                weeks.setdefault(week, []).append(node)
+            for genre in movie.genres:
+                genres.setdefault(slugify(genre), (genre, []))[1].append(node)
+
+        # Weeks - most recent first
+        week_dirs = []
+        for week in sorted(weeks, reverse=True):
+            identifier = f"{WEEK_IDENTIFIER}/{week.isoformat()}"
+            title = f"Week of {week:%d/%m/%Y}"
+            self._nodes[identifier] = (title, weeks[week])
+            week_dirs.append(self._directory(identifier, title))
+        self._nodes[WEEK_IDENTIFIER] = ("By week", week_dirs)
+
+        # Genres - alphabetical
+        genre_dirs = []
+        for slug, (genre, nodes) in sorted(genres.items(), key=lambda g: g[1][0]):
+            identifier = f"{GENRE_IDENTIFIER}/{slug}"
+            self._nodes[identifier] = (genre, nodes)
+            genre_dirs.append(self._directory(identifier, genre))
+        self._nodes[GENRE_IDENTIFIER] = ("By genre", genre_dirs)
+
+        # Rank buckets - movies are already sorted by popularity
+        rank_dirs = []
+        for start in range(0, len(movie_nodes), BROWSE_RANK_BUCKET_SIZE):
+            bucket = movie_nodes[start : start + BROWSE_RANK_BUCKET_SIZE]
+            identifier = f"{RANK_IDENTIFIER}/{start + 1}-{start + len(bucket)}"
+            title = f"Top {start + 1}-{start + len(bucket)}"
+            self._nodes[identifier] = (title, bucket)
+            rank_dirs.append(self._directory(identifier, title))
+        self._nodes[RANK_IDENTIFIER] = ("By popularity", rank_dirs)
+
+        # Root - directories first, then this week's movies
+        root_dirs = [
+            self._directory(identifier, self._nodes[identifier][0])
+            for identifier in (WEEK_IDENTIFIER, GENRE_IDENTIFIER, RANK_IDENTIFIER)
+        ]
+        root_dirs.append(self._directory(ARCHIVE_IDENTIFIER, "Archive"))
+        if self.has_showtimes:
+            root_dirs.append(self._directory(SHOWTIMES_IDENTIFIER, "Showtimes"))
+        self._nodes[ROOT_IDENTIFIER] = (ROOT_TITLE, root_dirs + movie_nodes)
+
+    def _build_archive(
+        self,
+        archive: dict[str, list[ArchivedRelease]],
+        archive_top: list[ArchivedRelease],
+    ) -> None:
+        """Group archived movies by week, plus the top of the last month."""
+        week_dirs = []
+        for week, releases in archive.items():
+            identifier = f"{ARCHIVE_IDENTIFIER}/{week}"
+            title = f"Week of {date.fromisoformat(week):%d/%m/%Y}"
+            self._nodes[identifier] = (
+                title,
+                [self._archived_movie_node(release) for release in releases],
+            )
+            week_dirs.append(self._directory(identifier, title))
+
+        top_title = "Top of the last month"
+        self._nodes[ARCHIVE_TOP_IDENTIFIER] = (
+            top_title,
+            [self._archived_movie_node(release) for release in archive_top],
+        )
+        self._nodes[ARCHIVE_IDENTIFIER] = (
+            "Archive",
+            [self._directory(ARCHIVE_TOP_IDENTIFIER, top_title), *week_dirs],
+        )
+
+    def browse(self, identifier: str | None) -> BrowseMediaSource | None:
+        """Return a node (or one of its pages), None if it doesn't exist."""
+        # Equivalent spellings of a page share a single key
+        node, offset, limit = parse_identifier(identifier)
+        key = page_identifier(node, offset, limit)
+
+        if (page := self._pages.get(key)) is None:
+            if node not in self._nodes:
+                return None
+            page = self._render(node, offset, limit)
+            if self._is_canonical_page(node, offset, limit):
+                self._pages[key] = page
+
+        # Callers may filter children in place - never hand out the cached list
+        page = copy.copy(page)
+        if page.children is not None:
+            page.children = list(page.children)
+        return page
+
+    def _is_canonical_page(self, node: str, offset: int, limit: int) -> bool:
+        """Return whether a page is reachable from "More", the only ones memoized."""
+        return (
+            limit == BROWSE_PAGE_SIZE
+            and offset % limit == 0
+            and offset < len(self._nodes[node][1])
+        )
+
+    def _render(self, node: str, offset: int, limit: int) -> BrowseMediaSource:
+        """Render one page of a node's children."""
+        title, children = self._nodes[node]
+        page = children[offset : offset + limit]
+
+        if offset + limit < len(children):
+            page.append(
+                self._directory(
+                    page_identifier(node, offset + limit, limit),
+                    f"More ({offset + limit + 1}-{min(offset + 2 * limit, len(children))}"
+                    f" of {len(children)})",
+                )
+            )
+
+        if offset:
+            title = f"{title} ({offset + 1}-{min(offset + limit, len(children))})"
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=page_identifier(node, offset, limit),
+            media_class=MediaClass.DIRECTORY,
+            media_content_type=MediaType.IMAGE,
+            title=title,
+            can_play=False,
+            can_expand=True,
+            children=page,
+        )
+
+    @staticmethod
+    def _directory(identifier: str, title: str) -> BrowseMediaSource:
+        """Build a collapsed directory node."""
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=identifier,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type=MediaType.IMAGE,
+            title=title,
+            can_play=False,
+            can_expand=True,
+        )
+
+    @staticmethod
+    def _movie_node(movie: AllocineMovie) -> BrowseMediaSource:
+        """Build the playable node of a movie poster."""
+        return PosterBrowseMedia(
+            domain=DOMAIN,
+            identifier=movie.id,
+            media_class=MediaClass.IMAGE,
+            media_content_type=MediaType.IMAGE,
+            title=movie.title,
+            can_play=True,
+            can_expand=False,
+            thumbnail=poster_url(movie),
+            placeholder=movie.placeholder,
+        )
+
+    def _archived_movie_node(self, release: ArchivedRelease) -> BrowseMediaSource:
+        """Build the playable node of an archived movie poster."""
+        identifier = archive_identifier(release)
+        node = PosterBrowseMedia(
+            domain=DOMAIN,
+            identifier=identifier,
+            media_class=MediaClass.IMAGE,
+            media_content_type=MediaType.IMAGE,
+            title=release.movie.title,
+            can_play=True,
+            can_expand=False,
+            thumbnail=archive_poster_url(release.week, release.movie.id),
+            placeholder=release.movie.placeholder,
+        )
+        self._pages[identifier] = node
+        return node
+
+
+def search_node(
+    query: str, results: list[ArchivedRelease], live_ids: set[str]
+) -> BrowseMediaSource:
+    """Build the node listing the results of a search."""
+    children = []
+    for release in results:
+        # Posters of past weeks are only kept in the archive
+        if release.movie.id in live_ids:
+            identifier = release.movie.id
+            thumbnail = poster_url(release.movie)
+        else:
+            identifier = archive_identifier(release)
+            thumbnail = archive_poster_url(release.week, release.movie.id)
+
+        children.append(
+            PosterBrowseMedia(
+                domain=DOMAIN,
+                identifier=identifier,
+                media_class=MediaClass.IMAGE,
+                media_content_type=MediaType.IMAGE,
+                title=f"{release.movie.title} ({release.week[:4]})",
+                can_play=True,
+                can_expand=False,
+                thumbnail=thumbnail,
+                placeholder=release.movie.placeholder,
+            )
+        )
+
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=f"{SEARCH_IDENTIFIER}/{query}",
+        media_class=MediaClass.DIRECTORY,
+        media_content_type=MediaType.IMAGE,
+        title=f"Search: {query}",
+        can_play=False,
+        can_expand=True,
+        children=children,
+    )
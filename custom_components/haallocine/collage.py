@@ -0,0 +1,123 @@
+"""Pre-rendered poster collage and slideshow for HAAllocine."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import io
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .allocine_api import AllocineMovie
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+
+# Pillow is imported on first use, rendering only happens once per data update
+
+_LOGGER = logging.getLogger(__name__)
+
+POSTER_HEIGHT = 600
+POSTER_WIDTH = 400
+GAP = 8
+BACKGROUND = (0, 0, 0)
+
+
+@dataclass
+class RenderedImage:
+    """An image rendered from the current posters."""
+
+    body: bytes
+    content_type: str
+    etag: str
+
+
+def render_collages(movies: list[AllocineMovie]) -> dict[str, RenderedImage]:
+    """Render the collage and slideshow of movie posters (blocking operation)."""
+    posters = _load_posters(movies)
+    if not posters:
+        _LOGGER.warning("No cached posters available to render a collage")
+        return {}
+
+    collage = _render_collage(posters)
+    slideshow = _render_slideshow(posters)
+    images = {
+        "collage.jpg": RenderedImage(
+            body=collage, content_type="image/jpeg", etag=_etag(collage)
+        ),
+        "slideshow.gif": RenderedImage(
+            body=slideshow, content_type="image/gif", etag=_etag(slideshow)
+        ),
+    }
+
+    for poster in posters:
+        poster.close()
+
+    _LOGGER.info(
+        "Rendered collage of %d posters (%d KB) and slideshow (%d KB)",
+        len(posters),
+        len(images["collage.jpg"].body) // 1024,
+        len(images["slideshow.gif"].body) // 1024,
+    )
+    return images
+
+
+def _etag(body: bytes) -> str:
+    """Return an ETag derived from the content, stable across restarts."""
+    return f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()[:16]}"'
+
+
+def _load_posters(movies: list[AllocineMovie]) -> list[Image]:
+    """Load and normalize cached posters to the same size."""
+    from PIL import Image, ImageOps  # noqa: PLC0415
+
+    posters = []
+    for movie in movies:
+        if not movie.local_poster_path or not Path(movie.local_poster_path).exists():
+            _LOGGER.debug("Skipping %s in collage: no cached poster", movie.title)
+            continue
+
+        try:
+            with Image.open(movie.local_poster_path) as image:
+                posters.append(
+                    ImageOps.pad(
+                        image.convert("RGB"),
+                        (POSTER_WIDTH, POSTER_HEIGHT),
+                        color=BACKGROUND,
+                    )
+                )
+        except OSError as err:
+            _LOGGER.warning("Failed to load poster for %s: %s", movie.title, err)
+
+    return posters
+
+
+def _render_collage(posters: list[Image]) -> bytes:
+    """Lay posters out side by side in one JPEG."""
+    from PIL import Image  # noqa: PLC0415
+
+    width = len(posters) * POSTER_WIDTH + (len(posters) - 1) * GAP
+    canvas = Image.new("RGB", (width, POSTER_HEIGHT), BACKGROUND)
+
+    for position, poster in enumerate(posters):
+        canvas.paste(poster, (position * (POSTER_WIDTH + GAP), 0))
+
+    buffer = io.BytesIO()
+    canvas.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+def _render_slideshow(posters: list[Image], frame_duration: int = 5000) -> bytes:
+    """Render posters as the frames of a looping animated GIF."""
+    buffer = io.BytesIO()
+    posters[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=posters[1:],
+        duration=frame_duration,
+        loop=0,
+        optimize=True,
+    )
+    return buffer.getvalue()
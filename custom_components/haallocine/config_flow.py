@@ -5,9 +5,17 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+import voluptuous as vol
 
-from .const import DOMAIN
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+
+from .const import CONF_THEATERS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,6 +25,12 @@ class AllocineConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> AllocineOptionsFlow:
+        """Get the options flow for this handler."""
+        return AllocineOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -36,3 +50,33 @@ class AllocineConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Show empty form (no configuration needed)
         return self.async_show_form(step_id="user")
+
+
+class AllocineOptionsFlow(OptionsFlow):
+    """Handle options for HAAllocine."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the theaters to fetch showtimes for."""
+        if user_input is not None:
+            theaters = parse_theaters(user_input.get(CONF_THEATERS, ""))
+            _LOGGER.info("Updating HAAllocine theaters: %s", theaters)
+            return self.async_create_entry(data={CONF_THEATERS: theaters})
+
+        current = ", ".join(self.config_entry.options.get(CONF_THEATERS, []))
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {vol.Optional(CONF_THEATERS, default=current): str}
+            ),
+        )
+
+
+def parse_theaters(value: str) -> list[str]:
+    """Parse a comma separated list of Allocine theater IDs (e.g. "C0159")."""
+    return list(
+        dict.fromkeys(
+            theater.strip().upper() for theater in value.split(",") if theater.strip()
+        )
+    )
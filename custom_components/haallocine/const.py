@@ -4,6 +4,48 @@ DOMAIN = "haallocine"
 
 # Service names
 SERVICE_REFRESH = "refresh"
+SERVICE_SEARCH = "search"
+
+# Service fields
+ATTR_QUERY = "query"
+ATTR_LIMIT = "limit"
 
 # Allocine URLs
 ALLOCINE_WEEKLY_URL = "https://www.allocine.fr/film/sorties-semaine/"
+
+# Storage of the last scraped releases
+STORAGE_KEY = "haallocine.releases"
+STORAGE_VERSION = 1
+
+# Sent when the config entry unloads, ends websocket subscriptions
+SIGNAL_UNLOADED = f"{DOMAIN}_unloaded"
+
+# Next week's releases are staged ahead of the Wednesday 03:00 switch-over
+PREFETCH_LEAD_HOURS = 24
+PREFETCH_RETRY_MINUTES = 60
+
+# Options
+CONF_THEATERS = "theaters"
+
+# Showtimes are re-checked hourly but only re-fetched when the day changes
+SHOWTIMES_CHECK_INTERVAL_MINUTES = 60
+
+# Media browser
+BROWSE_PAGE_SIZE = 20
+BROWSE_MAX_PAGE_SIZE = 100
+BROWSE_RANK_BUCKET_SIZE = 10
+
+# Collage
+COLLAGE_MAX_POSTERS = 6
+
+# Archive of past releases
+ARCHIVE_RETENTION_WEEKS = 52
+ARCHIVE_TOP_DAYS = 30
+ARCHIVE_TOP_LIMIT = 20
+
+# Search
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 100
+
+# Sensors - lists in attributes are capped to keep states small
+SENSOR_MAX_LIST_ITEMS = 10
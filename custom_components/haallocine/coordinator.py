@@ -2,25 +2,58 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
 import logging
 from pathlib import Path
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .allocine_api import AllocineAPI, AllocineConnectionError, AllocineMovie, AllocineParseError
-from .const import DOMAIN
+from .allocine_api import (
+    AllocineAPI,
+    AllocineConnectionError,
+    AllocineMovie,
+    AllocineParseError,
+    release_week,
+)
+from .archive import AllocineArchive, ArchivedRelease
+from .collage import RenderedImage, render_collages
+from .const import (
+    ARCHIVE_RETENTION_WEEKS,
+    COLLAGE_MAX_POSTERS,
+    DOMAIN,
+    PREFETCH_LEAD_HOURS,
+    PREFETCH_RETRY_MINUTES,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .placeholder import analyze_posters
+from .search import SearchIndex, build_search_index
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class StagedRelease:
+    """Releases of a week, downloaded but not served yet."""
+
+    week: date
+    movies: list[AllocineMovie]
+
+
 class AllocineCoordinator(DataUpdateCoordinator[list[AllocineMovie]]):
     """Coordinator for Allocine data with Wednesday scheduling."""
 
     data: list[AllocineMovie]
 
+    CACHE_DIR = Path("/media/allocine")
+
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize coordinator."""
 
@@ -34,31 +67,85 @@ class AllocineCoordinator(DataUpdateCoordinator[list[AllocineMovie]]):
         )
 
         # Initialize API with cache directory
-        cache_dir = Path("/media/allocine")
+        cache_dir = self.CACHE_DIR
         self.api = AllocineAPI(cache_dir)
 
-        # Track scheduled update
-        self._scheduled_update = None
+        # Archive of past weeks, kept apart from the live cache
+        self.archive = AllocineArchive(cache_dir / "archive")
 
-    async def async_update_data(self) -> list[AllocineMovie]:
-        """Fetch data from Allocine (called on first refresh and manual updates)."""
-        _LOGGER.info("Starting Allocine data update")
+        # Title/genre search over current and archived releases
+        self.search_index = SearchIndex()
+
+        # Track scheduled prefetch and release
+        self._unsub_prefetch: CALLBACK_TYPE | None = None
+        self._unsub_release: CALLBACK_TYPE | None = None
+        self._unsub_catch_up: CALLBACK_TYPE | None = None
+
+        # Next week's releases, downloaded ahead of the switch-over
+        self._staged: StagedRelease | None = None
+
+        # Staging clears the week's directory and publishing prunes it, so
+        # stage-and-publish runs never overlap
+        self._update_lock = asyncio.Lock()
+
+        # Bumped on every data change, lets consumers memoize derived data
+        self.data_version = 0
+
+        # Collage and slideshow images, rendered once per data update
+        self.collages: dict[str, RenderedImage] = {}
+
+        # When the served releases were scraped
+        self._fetched_at: datetime | None = None
+
+        # Last scraped releases, restored on startup instead of re-scraping
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    @property
+    def outdated(self) -> bool:
+        """Return whether the served releases were scraped before the last release time."""
+        return self._fetched_at is None or self._fetched_at < self._last_release_time()
+
+    async def async_restore(self) -> bool:
+        """Restore releases saved by the last update, False if there are none."""
+        if not (stored := await self._store.async_load()):
+            _LOGGER.debug("No saved releases to restore")
+            return False
+
+        # Versions keep counting across restarts, the restored data keeps its own
+        self.data_version = max(self.data_version, stored.get("version", 0))
+
+        fetched_at = dt_util.parse_datetime(stored.get("fetched_at", ""))
 
         try:
-            # Clear old cache before fetching new data
-            await self.hass.async_add_executor_job(self.api.clear_cache)
+            movies = [AllocineMovie(**movie) for movie in stored["movies"]]
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Failed to restore saved releases: %s", err)
+            return False
 
-            # Scrape weekly releases (blocking operation)
-            movies = await self.hass.async_add_executor_job(
-                self.api.scrape_weekly_releases
-            )
+        _LOGGER.info("Restored %d movies fetched at %s", len(movies), fetched_at)
+        self._fetched_at = fetched_at
+        if "version" not in stored:
+            self.data_version += 1
+        self.async_set_updated_data(movies)
+        self._schedule_updates()
 
-            _LOGGER.info("Successfully scraped %d movies from Allocine", len(movies))
+        # Collages are not needed to serve posters - render them in the background
+        self.hass.async_create_background_task(
+            self._async_update_collages(movies, self.data_version),
+            f"{DOMAIN} render collages",
+        )
+        return True
 
-            # Schedule next Wednesday update after successful fetch
-            self._schedule_next_wednesday_update()
+    async def async_update_data(self) -> list[AllocineMovie]:
+        """Fetch data from Allocine (called on first refresh and manual updates)."""
+        _LOGGER.info("Starting Allocine data update")
 
-            return movies
+        try:
+            week = release_week(dt_util.now().date().isoformat())
+            async with self._update_lock:
+                staged = await self._async_stage(week, upcoming=False)
+                await self._async_publish(staged)
+            return self.data
 
         except AllocineConnectionError as err:
             _LOGGER.error("Connection error: %s", err)
@@ -70,43 +157,258 @@ class AllocineCoordinator(DataUpdateCoordinator[list[AllocineMovie]]):
             _LOGGER.exception("Unexpected error during update")
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-    def _schedule_next_wednesday_update(self) -> None:
-        """Schedule update for next Wednesday at 03:00."""
-        # Cancel existing scheduled update
-        if self._scheduled_update:
-            self._scheduled_update.cancel()
-            self._scheduled_update = None
+    async def _async_stage(self, week: date, upcoming: bool) -> StagedRelease:
+        """Scrape a week's releases and posters into its staging area."""
+        staging_dir = self.api.staging_dir(week)
+        await self.hass.async_add_executor_job(self.api.clear_staging, week)
+
+        # Scrape weekly releases (blocking operation)
+        movies = await self.hass.async_add_executor_job(
+            self.api.scrape_weekly_releases, week if upcoming else None, staging_dir
+        )
+        # Analyzed once per download, clients paint placeholders before posters load
+        await self.hass.async_add_executor_job(analyze_posters, movies)
+
+        _LOGGER.info("Staged %d movies for week of %s", len(movies), week)
+        return StagedRelease(week=week, movies=movies)
+
+    async def _async_publish(self, staged: StagedRelease) -> None:
+        """Swap staged releases in, listeners are notified by the caller."""
+        movies = staged.movies
+        version = self.data_version + 1
+
+        # Rendered and archived from the staged posters, before anything is swapped
+        collages = await self._async_render_collages(movies)
+        await self._async_archive_releases(staged.week, movies)
+
+        # Swapped together, nothing may see the new version with the old data
+        self.data_version, self.collages, self.data = version, collages, movies
+
+        # Posters are served from staging until they are promoted
+        live_paths = await self.hass.async_add_executor_job(
+            self.api.promote_staging, movies
+        )
+        for movie, live_path in zip(movies, live_paths, strict=True):
+            movie.local_poster_path = live_path
+        # Nothing points into the published week's staging area anymore
+        await self.hass.async_add_executor_job(self.api.prune_staging, staged.week)
+
+        self._fetched_at = dt_util.utcnow()
+        await self._store.async_save(
+            {
+                "fetched_at": self._fetched_at.isoformat(),
+                "version": self.data_version,
+                "movies": [asdict(movie) for movie in movies],
+            }
+        )
+
+        # Schedule next Wednesday update after successful fetch
+        self._schedule_updates()
 
-        # Calculate next Wednesday
-        now = datetime.now()
-        days_until_wednesday = (2 - now.weekday()) % 7  # Wednesday is 2
+    async def async_catch_up(self, _now: datetime | None = None) -> None:
+        """Fetch this week's releases while outdated ones are served, until it works."""
+        self._unsub_catch_up = None
+        week = release_week(dt_util.now().date().isoformat())
 
-        if days_until_wednesday == 0:
-            # Today is Wednesday - schedule for next week
-            days_until_wednesday = 7
+        try:
+            async with self._update_lock:
+                # A regular update may have fetched them meanwhile
+                if not self.outdated:
+                    _LOGGER.debug("Releases for week of %s already fetched", week)
+                    return
+                staged = await self._async_stage(week, upcoming=False)
+                await self._async_publish(staged)
+        except Exception as err:
+            # Don't fail anything, the restored releases are still served meanwhile
+            _LOGGER.warning(
+                "Failed to fetch this week's releases, retrying in %d minutes: %s",
+                PREFETCH_RETRY_MINUTES,
+                err,
+            )
+            self._unsub_catch_up = async_call_later(
+                self.hass, timedelta(minutes=PREFETCH_RETRY_MINUTES), self.async_catch_up
+            )
+            return
+
+        _LOGGER.info("Caught up with %d movies for week of %s", len(self.data), week)
+        self.async_set_updated_data(self.data)
+
+    async def _async_render_collages(
+        self, movies: list[AllocineMovie]
+    ) -> dict[str, RenderedImage]:
+        """Render collage images of movies."""
+        try:
+            return await self.hass.async_add_executor_job(
+                render_collages, movies[:COLLAGE_MAX_POSTERS]
+            )
+        except Exception:
+            # Don't fail the update, posters are still served individually
+            _LOGGER.exception("Failed to render poster collage")
+            return {}
+
+    async def _async_update_collages(self, movies: list[AllocineMovie], version: int) -> None:
+        """Render collage images of data already being served."""
+        collages = await self._async_render_collages(movies)
+        # An update may have swapped in newer data and collages meanwhile
+        if self.data_version == version:
+            self.collages = collages
 
-        next_wednesday = now + timedelta(days=days_until_wednesday)
-        next_wednesday = next_wednesday.replace(
-            hour=3, minute=0, second=0, microsecond=0
+    async def _async_archive_releases(self, week: date, movies: list[AllocineMovie]) -> None:
+        """Append a week's releases to the archive and prune old weeks."""
+
+        def archive() -> list[str]:
+            self.archive.record_week(week, movies)
+            return self.archive.prune(ARCHIVE_RETENTION_WEEKS)
+
+        pruned: list[str] = []
+        try:
+            pruned = await self.hass.async_add_executor_job(archive)
+        except Exception:
+            # Don't fail the update, the live data is still valid
+            _LOGGER.exception("Failed to archive releases")
+
+        # Only this week changes in the search index
+        self.search_index.replace_week(
+            week.isoformat(),
+            [
+                ArchivedRelease(week=week.isoformat(), rank=rank, movie=movie)
+                for rank, movie in enumerate(movies, 1)
+            ],
         )
+        self.search_index.remove_weeks(pruned)
+
+    async def async_load_search_index(self) -> None:
+        """Build the search index from the archive (a full rebuild, at startup)."""
+        try:
+            index = await self.hass.async_add_executor_job(
+                lambda: build_search_index(self.archive.releases_by_week())
+            )
+        except Exception:
+            _LOGGER.exception("Failed to build search index from the archive")
+            return
+
+        # Releases added while the index was being built are kept
+        for week in self.search_index.weeks:
+            index.replace_week(week, self.search_index.releases_for_week(week))
+        self.search_index = index
+        _LOGGER.info("Search index ready with %d releases", len(index))
+
+    @staticmethod
+    def _last_release_time() -> datetime:
+        """Return the last Wednesday at 03:00, when releases are refreshed."""
+        now = dt_util.now()
+        last_wednesday = now - timedelta(days=(now.weekday() - 2) % 7)
+        last_release = last_wednesday.replace(hour=3, minute=0, second=0, microsecond=0)
 
-        seconds_until_wednesday = (next_wednesday - now).total_seconds()
+        # Wednesday before 03:00 - the last refresh was a week ago
+        if last_release > now:
+            last_release -= timedelta(days=7)
+
+        return last_release
+
+    @classmethod
+    def _next_release_time(cls) -> datetime:
+        """Return the next Wednesday at 03:00."""
+        return cls._last_release_time() + timedelta(days=7)
+
+    @callback
+    def _schedule_updates(self) -> None:
+        """Schedule next week's prefetch and its release on Wednesday at 03:00."""
+        if self._unsub_release:
+            self._unsub_release()
+        release_time = self._next_release_time()
+        self._unsub_release = async_track_point_in_time(
+            self.hass, self._async_release, release_time
+        )
+
+        week = release_time.date()
+        if self._staged is not None and self._staged.week == week:
+            _LOGGER.info("Releases for week of %s already staged", week)
+            return
+
+        # Past the prefetch time already (e.g. a restart on Tuesday) - stage soon
+        prefetch_time = max(
+            release_time - timedelta(hours=PREFETCH_LEAD_HOURS),
+            dt_util.now() + timedelta(minutes=1),
+        )
+        self._schedule_prefetch(prefetch_time)
 
         _LOGGER.info(
-            "Scheduling next update for %s (in %.1f hours)",
-            next_wednesday.strftime("%Y-%m-%d %H:%M"),
-            seconds_until_wednesday / 3600,
+            "Scheduling prefetch for %s and release for %s",
+            prefetch_time.strftime("%Y-%m-%d %H:%M"),
+            release_time.strftime("%Y-%m-%d %H:%M"),
         )
 
-        # Schedule update using event loop
-        self._scheduled_update = self.hass.loop.call_later(
-            seconds_until_wednesday,
-            lambda: self.hass.create_task(self.async_request_refresh()),
+    @callback
+    def _schedule_prefetch(self, prefetch_time: datetime) -> None:
+        """Schedule staging of next week's releases."""
+        if self._unsub_prefetch:
+            self._unsub_prefetch()
+        self._unsub_prefetch = async_track_point_in_time(
+            self.hass, self._async_prefetch, prefetch_time
         )
 
+    async def _async_prefetch(self, _now: datetime) -> None:
+        """Stage next week's releases off-peak, well before they are shown."""
+        self._unsub_prefetch = None
+        release_time = self._next_release_time()
+
+        try:
+            async with self._update_lock:
+                staged = await self._async_stage(release_time.date(), upcoming=True)
+        except Exception as err:
+            # Don't fail anything, the release falls back to a regular update
+            retry_time = dt_util.now() + timedelta(minutes=PREFETCH_RETRY_MINUTES)
+            if retry_time < release_time:
+                _LOGGER.warning("Failed to prefetch next week's releases, retrying: %s", err)
+                self._schedule_prefetch(retry_time)
+            else:
+                _LOGGER.warning("Failed to prefetch next week's releases: %s", err)
+            return
+
+        self._staged = staged
+
+    async def _async_release(self, _now: datetime) -> None:
+        """Swap the staged releases in at release time."""
+        self._unsub_release = None
+        staged, self._staged = self._staged, None
+        week = release_week(dt_util.now().date().isoformat())
+
+        # The refresh takes the lock itself, so it is requested once released
+        async with self._update_lock:
+            if not self.outdated:
+                # A catch-up already fetched them, and cleared what was staged
+                _LOGGER.info("Releases for week of %s already fetched", week)
+                self._schedule_updates()
+                return
+
+            published = False
+            if staged is None or staged.week != week:
+                _LOGGER.info("No releases staged for week of %s, fetching them now", week)
+            else:
+                try:
+                    await self._async_publish(staged)
+                    published = True
+                except Exception:
+                    _LOGGER.exception("Failed to publish staged releases, fetching them now")
+
+        if not published:
+            self._schedule_updates()
+            await self.async_request_refresh()
+            return
+
+        _LOGGER.info("Published %d staged movies for week of %s", len(self.data), week)
+        self.async_set_updated_data(self.data)
+
     async def async_shutdown(self) -> None:
         """Cancel scheduled updates on shutdown."""
         _LOGGER.info("Shutting down coordinator and canceling scheduled updates")
-        if self._scheduled_update:
-            self._scheduled_update.cancel()
-            self._scheduled_update = None
+        if self._unsub_release:
+            self._unsub_release()
+            self._unsub_release = None
+        if self._unsub_prefetch:
+            self._unsub_prefetch()
+            self._unsub_prefetch = None
+        if self._unsub_catch_up:
+            self._unsub_catch_up()
+            self._unsub_catch_up = None
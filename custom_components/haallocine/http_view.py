@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+import re
 
 from aiohttp import web
 from aiohttp.web import HTTPNotFound
@@ -15,6 +16,10 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# Archived posters are stored as <week>/<movie_id>.jpg
+ARCHIVE_WEEK_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+ARCHIVE_MOVIE_ID_RE = re.compile(r"^[A-Za-z0-9_=-]+$")
+
 
 class AllocinePosterView(HomeAssistantView):
     """View to serve poster images."""
@@ -57,4 +62,80 @@ class AllocinePosterView(HomeAssistantView):
             return web.Response(status=404, text="Poster file not found")
 
         _LOGGER.debug("Serving poster from: %s", poster_path)
+
+        # Versioned URLs (?v=<data version>) never change content
+        if "v" in request.query:
+            return web.FileResponse(
+                poster_path,
+                headers={"Cache-Control": "public, max-age=31536000, immutable"},
+            )
+        return web.FileResponse(poster_path)
+
+
+class AllocineCollageView(HomeAssistantView):
+    """View to serve the pre-rendered poster collage and slideshow."""
+
+    url = "/api/haallocine/collage/{name}"
+    name = "api:haallocine:collage"
+    requires_auth = False  # Wall displays need unauthenticated access
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, name: str) -> web.Response:
+        """Serve collage image (collage.jpg or slideshow.gif)."""
+        _LOGGER.debug("Serving collage: %s", name)
+
+        # Get coordinator from runtime data
+        if not (config_entries := self.hass.config_entries.async_loaded_entries(DOMAIN)):
+            raise HTTPNotFound
+
+        coordinator = config_entries[0].runtime_data.coordinator
+
+        if not (image := coordinator.collages.get(name)):
+            _LOGGER.warning("Collage not available: %s", name)
+            return web.Response(status=404, text="Collage not found")
+
+        # ETags are derived from the image content - let clients revalidate
+        headers = {"ETag": image.etag, "Cache-Control": "no-cache"}
+        if image.etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(
+            body=image.body, content_type=image.content_type, headers=headers
+        )
+
+
+class AllocineArchivePosterView(HomeAssistantView):
+    """View to serve archived poster images."""
+
+    url = "/api/haallocine/archive/{week}/{movie_id}"
+    name = "api:haallocine:archive"
+    requires_auth = False  # Media players need unauthenticated access
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, week: str, movie_id: str) -> web.Response:
+        """Serve archived poster image."""
+        # Strip .jpg extension if present
+        movie_id = movie_id.replace(".jpg", "")
+
+        _LOGGER.debug("Serving archived poster for week %s, movie ID: %s", week, movie_id)
+
+        # Only accept well-formed names, they are used to build a file path
+        if not ARCHIVE_WEEK_RE.match(week) or not ARCHIVE_MOVIE_ID_RE.match(movie_id):
+            raise HTTPNotFound
+
+        # Get coordinator from runtime data
+        if not (config_entries := self.hass.config_entries.async_loaded_entries(DOMAIN)):
+            raise HTTPNotFound
+
+        coordinator = config_entries[0].runtime_data.coordinator
+        poster_path = coordinator.archive.poster_path(week, movie_id)
+
+        # FileResponse answers 404 itself if the poster was pruned
+        _LOGGER.debug("Serving archived poster from: %s", poster_path)
         return web.FileResponse(poster_path)
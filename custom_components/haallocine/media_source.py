@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 
 from homeassistant.components.media_player import MediaClass, MediaType
@@ -13,9 +14,25 @@ from homeassistant.components.media_source import (
     Unresolvable,
 )
 from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
-from .http_view import AllocinePosterView
+from homeassistant.util import dt as dt_util
+
+from .archive import AllocineArchive, ArchivedRelease
+from .browse import (
+    ARCHIVE_IDENTIFIER,
+    SEARCH_IDENTIFIER,
+    SHOWTIMES_IDENTIFIER,
+    BrowseTree,
+    archive_poster_url,
+    poster_url,
+    search_node,
+)
+from .const import (
+    ARCHIVE_TOP_DAYS,
+    ARCHIVE_TOP_LIMIT,
+    BROWSE_PAGE_SIZE,
+    DOMAIN,
+)
+from .showtimes import ShowtimeIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,8 +40,17 @@ _LOGGER = logging.getLogger(__name__)
 async def async_get_media_source(hass: HomeAssistant) -> AllocineMediaSource:
     """Set up Allocine media source."""
     _LOGGER.debug("Setting up Allocine media source")
+    # Views are only needed once the media source is used
+    from .http_view import (  # noqa: PLC0415
+        AllocineArchivePosterView,
+        AllocineCollageView,
+        AllocinePosterView,
+    )
+
     # Register HTTP view for serving posters (like Immich does)
     hass.http.register_view(AllocinePosterView(hass))
+    hass.http.register_view(AllocineCollageView(hass))
+    hass.http.register_view(AllocineArchivePosterView(hass))
     return AllocineMediaSource(hass)
 
 
@@ -37,6 +63,7 @@ class AllocineMediaSource(MediaSource):
         """Initialize media source."""
         super().__init__(DOMAIN)
         self.hass = hass
+        self._tree: BrowseTree | None = None
 
     async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
         """Resolve media item to playable URL."""
@@ -50,6 +77,15 @@ class AllocineMediaSource(MediaSource):
 
         coordinator = config_entries[0].runtime_data.coordinator
 
+        # Archived movie - archive/<week>/<movie_id>
+        if movie_id and movie_id.startswith(f"{ARCHIVE_IDENTIFIER}/"):
+            _, week, archived_id = (movie_id.split("/") + ["", ""])[:3]
+            if not week or not archived_id:
+                raise Unresolvable(f"Archived movie {movie_id} not found")
+            return PlayMedia(
+                url=archive_poster_url(week, archived_id), mime_type="image/jpeg"
+            )
+
         # Find movie in coordinator data
         movie = next(
             (m for m in coordinator.data if m.id == movie_id),
@@ -60,7 +96,7 @@ class AllocineMediaSource(MediaSource):
             raise Unresolvable(f"Movie {movie_id} not found")
 
         # Return URL to our HTTP view
-        url = f"/api/haallocine/poster/{movie_id}.jpg"
+        url = poster_url(movie)
         _LOGGER.debug("Resolved media URL: %s", url)
 
         return PlayMedia(
@@ -81,52 +117,121 @@ class AllocineMediaSource(MediaSource):
 
         coordinator = config_entries[0].runtime_data.coordinator
 
+        showtimes = config_entries[0].runtime_data.showtimes
+
         if not coordinator.data:
             _LOGGER.warning("No movie data available")
 
-        # Root level - show all movies (identifier is None or empty)
-        if not item.identifier:
-            _LOGGER.debug("Showing root level with %d movies", len(coordinator.data))
+        # Showtimes depend on the current time - answered live from their index
+        if item.identifier and item.identifier.startswith(SHOWTIMES_IDENTIFIER):
+            if showtimes is None or showtimes.data is None:
+                raise Unresolvable("Showtimes are not available")
+            return self._browse_showtimes(showtimes.data, item.identifier)
+
+        # Searches - search/<query>, answered from the search index
+        if item.identifier and item.identifier.startswith(f"{SEARCH_IDENTIFIER}/"):
+            query = item.identifier.partition("/")[2]
+            return search_node(
+                query,
+                coordinator.search_index.search(query, BROWSE_PAGE_SIZE),
+                {movie.id for movie in coordinator.data or []},
+            )
+
+        # Everything else comes from the tree memoized for this data version
+        has_showtimes = showtimes is not None
+        if (
+            self._tree is None
+            or self._tree.version != coordinator.data_version
+            or self._tree.has_showtimes != has_showtimes
+        ):
+            # The archive only changes along with the data - query it once here
+            archive, archive_top = await self.hass.async_add_executor_job(
+                self._load_archive, coordinator.archive
+            )
+            self._tree = BrowseTree(
+                coordinator.data_version,
+                coordinator.data or [],
+                has_showtimes,
+                archive,
+                archive_top,
+            )
+
+        if (node := self._tree.browse(item.identifier)) is None:
+            raise Unresolvable(f"Unknown media item {item.identifier}")
+
+        return node
+
+    @staticmethod
+    def _load_archive(
+        archive: AllocineArchive,
+    ) -> tuple[dict[str, list[ArchivedRelease]], list[ArchivedRelease]]:
+        """Query archived weeks and the top of the last month (blocking operation)."""
+        try:
+            return archive.releases_by_week(), archive.top_releases(
+                dt_util.now().date() - timedelta(days=ARCHIVE_TOP_DAYS),
+                ARCHIVE_TOP_LIMIT,
+            )
+        except Exception:
+            # Browsing current releases must keep working without the archive
+            _LOGGER.exception("Failed to load archived releases")
+            return {}, []
+
+    def _browse_showtimes(
+        self, index: ShowtimeIndex, identifier: str
+    ) -> BrowseMediaSource:
+        """Browse upcoming showings, answered from the local showtimes index."""
+        now = dt_util.now()
+        _, _, theater_id = identifier.partition("/")
+
+        # Showtimes root - one directory per theater
+        if not theater_id:
             return BrowseMediaSource(
                 domain=DOMAIN,
-                identifier="",
+                identifier=SHOWTIMES_IDENTIFIER,
                 media_class=MediaClass.DIRECTORY,
                 media_content_type=MediaType.IMAGE,
-                title="Allocine Weekly Releases",
+                title="Showtimes",
                 can_play=False,
                 can_expand=True,
                 children=[
                     BrowseMediaSource(
                         domain=DOMAIN,
-                        identifier=movie.id,
-                        media_class=MediaClass.IMAGE,
+                        identifier=f"{SHOWTIMES_IDENTIFIER}/{theater}",
+                        media_class=MediaClass.DIRECTORY,
                         media_content_type=MediaType.IMAGE,
-                        title=movie.title,
-                        can_play=True,
-                        can_expand=False,
-                        thumbnail=f"/api/haallocine/poster/{movie.id}.jpg",
+                        title=theater,
+                        can_play=False,
+                        can_expand=True,
                     )
-                    for movie in coordinator.data
+                    for theater in index.theaters
                 ],
             )
 
-        # Individual movie selected
-        movie = next(
-            (m for m in coordinator.data if m.id == item.identifier),
-            None,
-        )
-
-        if not movie:
-            raise Unresolvable(f"Movie {item.identifier} not found")
+        # Theater - next showing of every movie still playing today
+        children = []
+        for movie_id, title in index.movies_at(theater_id).items():
+            showing = index.next_showing(now, movie_id=movie_id, theater_id=theater_id)
+            if showing is None:
+                continue
+            children.append(
+                BrowseMediaSource(
+                    domain=DOMAIN,
+                    identifier=movie_id,
+                    media_class=MediaClass.IMAGE,
+                    media_content_type=MediaType.IMAGE,
+                    title=f"{dt_util.as_local(showing.starts_at):%H:%M} - {title}",
+                    can_play=False,
+                    can_expand=False,
+                )
+            )
 
-        _LOGGER.debug("Showing individual movie: %s", movie.title)
         return BrowseMediaSource(
             domain=DOMAIN,
-            identifier=movie.id,
-            media_class=MediaClass.IMAGE,
+            identifier=identifier,
+            media_class=MediaClass.DIRECTORY,
             media_content_type=MediaType.IMAGE,
-            title=movie.title,
-            can_play=True,
-            can_expand=False,
-            thumbnail=f"/api/haallocine/poster/{movie.id}.jpg",
+            title=theater_id,
+            can_play=False,
+            can_expand=True,
+            children=children,
         )
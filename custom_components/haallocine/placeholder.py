@@ -0,0 +1,157 @@
+"""Placeholders painted by clients while a poster loads."""
+
+from __future__ import annotations
+
+import logging
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+
+    from .allocine_api import AllocineMovie
+
+# Pillow is imported on first use, posters are only analyzed when downloaded
+
+_LOGGER = logging.getLogger(__name__)
+
+# Posters are portrait, so more vertical than horizontal components
+BLURHASH_X_COMPONENTS = 3
+BLURHASH_Y_COMPONENTS = 4
+# Size posters are shrunk to before analysis, details don't matter
+SAMPLE_SIZE = 32
+DOMINANT_COLORS = 8
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+class PosterPlaceholder(TypedDict):
+    """Poster dimensions, dominant color and blurhash."""
+
+    width: int
+    height: int
+    color: str
+    blurhash: str
+
+
+def analyze_posters(movies: list[AllocineMovie]) -> None:
+    """Compute the placeholders of downloaded posters (blocking operation)."""
+    for movie in movies:
+        if not movie.local_poster_path:
+            continue
+        try:
+            movie.placeholder = analyze_poster(movie.local_poster_path)
+        except Exception as err:
+            # Don't drop the poster, clients just paint it without a placeholder
+            _LOGGER.warning("Failed to analyze poster for %s: %s", movie.title, err)
+
+
+def analyze_poster(path: Path | str) -> PosterPlaceholder:
+    """Compute the placeholder of a poster (blocking operation)."""
+    from PIL import Image  # noqa: PLC0415
+
+    with Image.open(path) as image:
+        width, height = image.size
+        sample = image.convert("RGB")
+        sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+
+    placeholder = PosterPlaceholder(
+        width=width,
+        height=height,
+        color=_dominant_color(sample),
+        blurhash=_blurhash(sample, BLURHASH_X_COMPONENTS, BLURHASH_Y_COMPONENTS),
+    )
+    _LOGGER.debug("Analyzed poster %s: %s", path, placeholder)
+    return placeholder
+
+
+def _dominant_color(image: Image) -> str:
+    """Return the most common color of an image, as #rrggbb."""
+    quantized = image.quantize(colors=DOMINANT_COLORS)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette() or [0, 0, 0]
+    red, green, blue = palette[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _blurhash(image: Image, x_components: int, y_components: int) -> str:
+    """Encode an image as a blurhash (https://blurha.sh)."""
+    width, height = image.size
+    pixels = [tuple(_srgb_to_linear(value) for value in pixel) for pixel in image.getdata()]
+
+    # Cosines only depend on the component and the row or column
+    cos_x = [
+        [math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)
+    ]
+    cos_y = [
+        [math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)
+    ]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalization = 1 if i == j == 0 else 2
+            red = green = blue = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * cos_y[j][y]
+                    pixel = pixels[row + x]
+                    red += basis * pixel[0]
+                    green += basis * pixel[1]
+                    blue += basis * pixel[2]
+            scale = normalization / (width * height)
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(value) for factor in ac for value in factor)
+        quantized_max = max(0, min(82, math.floor(actual_max * 166 - 0.5)))
+        max_value = (quantized_max + 1) / 166
+        result += _base83(quantized_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+
+    red, green, blue = (_linear_to_srgb(value) for value in dc)
+    result += _base83((red << 16) + (green << 8) + blue, 4)
+
+    for factor in ac:
+        red, green, blue = (
+            max(0, min(18, math.floor(_sign_pow(value / max_value, 0.5) * 9 + 9.5)))
+            for value in factor
+        )
+        result += _base83(red * 19 * 19 + green * 19 + blue, 2)
+
+    return result
+
+
+def _base83(value: int, length: int) -> str:
+    """Encode an integer in base 83 on a fixed number of digits."""
+    return "".join(
+        BASE83[(value // 83 ** (length - digit)) % 83] for digit in range(1, length + 1)
+    )
+
+
+def _srgb_to_linear(value: int) -> float:
+    """Convert an sRGB channel (0-255) to linear light (0-1)."""
+    channel = value / 255
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    """Convert linear light (0-1) to an sRGB channel (0-255)."""
+    channel = max(0.0, min(1.0, value))
+    if channel <= 0.0031308:
+        return int(channel * 12.92 * 255 + 0.5)
+    return int((1.055 * channel ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    """Raise the magnitude of a value to a power, keeping its sign."""
+    return math.copysign(abs(value) ** exponent, value)
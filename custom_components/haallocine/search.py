@@ -0,0 +1,178 @@
+"""In-memory title and genre search over current and archived releases."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+import heapq
+import logging
+import re
+import unicodedata
+
+from .archive import ArchivedRelease
+
+_LOGGER = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Ligatures NFKD leaves whole, they would split words ("cœur" -> "c", "ur")
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+
+def normalize(text: str) -> str:
+    """Lowercase, split ligatures and fold accents ("Cœur" -> "coeur")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold().translate(LIGATURES))
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into normalized tokens."""
+    return TOKEN_RE.findall(normalize(text))
+
+
+def release_key(release: ArchivedRelease) -> str:
+    """Return the key of a release in the index (a movie may span weeks)."""
+    return f"{release.week}/{release.movie.id}"
+
+
+class SearchIndex:
+    """Inverted index of title and genre tokens, answering prefix queries."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._releases: dict[str, ArchivedRelease] = {}
+        self._postings: dict[str, set[str]] = {}
+        # Sorted vocabulary, prefix queries bisect into it
+        self._tokens: list[str] = []
+        self._weeks: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed releases."""
+        return len(self._releases)
+
+    @property
+    def weeks(self) -> list[str]:
+        """Return the indexed weeks."""
+        return list(self._weeks)
+
+    def releases_for_week(self, week: str) -> list[ArchivedRelease]:
+        """Return the indexed releases of a week."""
+        return [self._releases[key] for key in self._weeks.get(week, ())]
+
+    def add(self, release: ArchivedRelease) -> None:
+        """Index a release, replacing any previous version of it."""
+        for token in self._add(release):
+            insort(self._tokens, token)
+
+    def add_many(self, releases: list[ArchivedRelease]) -> None:
+        """Index many releases, sorting the vocabulary only once."""
+        new_tokens = []
+        for release in releases:
+            new_tokens.extend(self._add(release))
+
+        if new_tokens:
+            self._tokens = sorted(self._postings)
+
+    def _add(self, release: ArchivedRelease) -> list[str]:
+        """Index a release, return the tokens new to the vocabulary."""
+        key = release_key(release)
+        if key in self._releases:
+            self.remove(key)
+
+        self._releases[key] = release
+        self._weeks.setdefault(release.week, set()).add(key)
+
+        new_tokens = []
+        for token in self._release_tokens(release):
+            if (posting := self._postings.get(token)) is None:
+                posting = self._postings[token] = set()
+                new_tokens.append(token)
+            posting.add(key)
+        return new_tokens
+
+    def remove(self, key: str) -> None:
+        """Remove a release from the index."""
+        if (release := self._releases.pop(key, None)) is None:
+            return
+
+        if (week_keys := self._weeks.get(release.week)) is not None:
+            week_keys.discard(key)
+            if not week_keys:
+                del self._weeks[release.week]
+
+        for token in self._release_tokens(release):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def replace_week(self, week: str, releases: list[ArchivedRelease]) -> None:
+        """Update the releases of a week, only touching what changed."""
+        new_keys = {release_key(release): release for release in releases}
+
+        for key in self._weeks.get(week, set()) - new_keys.keys():
+            self.remove(key)
+
+        self.add_many(
+            [
+                release
+                for key, release in new_keys.items()
+                if self._releases.get(key) != release
+            ]
+        )
+
+    def remove_weeks(self, weeks: list[str]) -> None:
+        """Remove every release of the given weeks (e.g. pruned from the archive)."""
+        for week in weeks:
+            for key in list(self._weeks.get(week, ())):
+                self.remove(key)
+
+    def search(self, query: str, limit: int = 10) -> list[ArchivedRelease]:
+        """Return releases matching every query token as a prefix."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        matches: set[str] | None = None
+        # Rarest tokens first keeps the intersections small
+        for keys in sorted((self._prefix_keys(token) for token in tokens), key=len):
+            matches = keys if matches is None else matches & keys
+            if not matches:
+                return []
+
+        # Most anticipated first, most recent week on ties
+        return heapq.nlargest(
+            limit,
+            (self._releases[key] for key in matches or ()),
+            key=lambda r: (r.movie.want_to_see_count, r.week),
+        )
+
+    def _prefix_keys(self, prefix: str) -> set[str]:
+        """Return the keys of releases having a token starting with a prefix."""
+        position = bisect_left(self._tokens, prefix)
+        postings = []
+        while position < len(self._tokens) and self._tokens[position].startswith(prefix):
+            postings.append(self._postings[self._tokens[position]])
+            position += 1
+        return set().union(*postings)
+
+    @staticmethod
+    def _release_tokens(release: ArchivedRelease) -> set[str]:
+        """Return the tokens of a release title and genres."""
+        tokens = set(tokenize(release.movie.title))
+        for genre in release.movie.genres:
+            tokens.update(tokenize(genre))
+        return tokens
+
+
+def build_search_index(releases: dict[str, list[ArchivedRelease]]) -> SearchIndex:
+    """Build an index of archived releases (run in the executor)."""
+    index = SearchIndex()
+    index.add_many(
+        [release for week_releases in releases.values() for release in week_releases]
+    )
+
+    _LOGGER.debug("Built search index of %d releases", len(index))
+    return index
@@ -0,0 +1,247 @@
+"""Sensor platform for HAAllocine."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.const import ATTR_ENTITY_PICTURE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from . import MyConfigEntry
+from .allocine_api import AllocineMovie, release_week
+from .browse import poster_url
+from .const import DOMAIN, SENSOR_MAX_LIST_ITEMS
+from .coordinator import AllocineCoordinator
+from .showtimes import ShowtimesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_GENRES = "genres"
+ATTR_MOVIES = "movies"
+ATTR_PLACEHOLDER = "placeholder"
+ATTR_POSTER = "poster"
+ATTR_RELEASE_DATE = "release_date"
+ATTR_THEATER = "theater"
+ATTR_TITLE = "title"
+ATTR_VERSION = "version"
+ATTR_WANT_TO_SEE = "want_to_see_count"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: MyConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up HAAllocine sensors."""
+    coordinator = config_entry.runtime_data.coordinator
+
+    entities: list[SensorEntity] = [
+        AllocineTopMovieSensor(coordinator, config_entry),
+        AllocineReleaseCountSensor(coordinator, config_entry),
+        AllocineNewThisWeekSensor(coordinator, config_entry),
+    ]
+    if (showtimes := config_entry.runtime_data.showtimes) is not None:
+        entities.append(AllocineNextShowingSensor(showtimes, config_entry))
+
+    async_add_entities(entities)
+
+
+def _device_info(config_entry: MyConfigEntry) -> DeviceInfo:
+    """Return the device grouping the integration entities."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=config_entry.title,
+        manufacturer="Allocine",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+class AllocineSensor(CoordinatorEntity[AllocineCoordinator], SensorEntity):
+    """Base sensor computed from the releases, once per data version."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, coordinator: AllocineCoordinator, config_entry: MyConfigEntry, key: str
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
+        self._attr_device_info = _device_info(config_entry)
+        self._data_version: int | None = None
+        self._update_from_data()
+
+    @property
+    def available(self) -> bool:
+        """Return True while releases are served, even when the last update failed."""
+        # Failed updates don't bump the data version, so no state would be written
+        return self.coordinator.data is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the data actually changed."""
+        if self._data_version == self.coordinator.data_version:
+            return
+        self._update_from_data()
+        self.async_write_ha_state()
+
+    def _update_from_data(self) -> None:
+        """Compute state and attributes from the coordinator data."""
+        self._data_version = self.coordinator.data_version
+        self._compute(self.coordinator.data or [])
+
+    @abstractmethod
+    def _compute(self, movies: list[AllocineMovie]) -> None:
+        """Set native value and attributes."""
+
+
+class AllocineTopMovieSensor(AllocineSensor):
+    """Most anticipated movie of the week."""
+
+    _unrecorded_attributes = frozenset(
+        {ATTR_ENTITY_PICTURE, ATTR_GENRES, ATTR_PLACEHOLDER, ATTR_POSTER, ATTR_WANT_TO_SEE}
+    )
+
+    def __init__(self, coordinator: AllocineCoordinator, config_entry: MyConfigEntry) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, config_entry, "top_movie")
+
+    def _compute(self, movies: list[AllocineMovie]) -> None:
+        """Set the title of the #1 movie."""
+        if not movies:
+            self._attr_native_value = None
+            self._attr_entity_picture = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        movie = movies[0]
+        self._attr_native_value = movie.title
+        self._attr_entity_picture = poster_url(movie)
+        self._attr_extra_state_attributes = {
+            ATTR_RELEASE_DATE: movie.release_date,
+            ATTR_GENRES: movie.genres[:SENSOR_MAX_LIST_ITEMS],
+            ATTR_POSTER: poster_url(movie),
+            ATTR_PLACEHOLDER: movie.placeholder,
+            ATTR_WANT_TO_SEE: movie.want_to_see_count,
+        }
+
+
+class AllocineReleaseCountSensor(AllocineSensor):
+    """Number of movies kept for the week."""
+
+    # No state class - long-term statistics of a weekly value only grow the database
+
+    def __init__(self, coordinator: AllocineCoordinator, config_entry: MyConfigEntry) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, config_entry, "release_count")
+
+    def _compute(self, movies: list[AllocineMovie]) -> None:
+        """Set the number of movies."""
+        self._attr_native_value = len(movies)
+
+
+class AllocineNewThisWeekSensor(AllocineSensor):
+    """Movies released this week, with a size-capped list of them."""
+
+    # The list is only useful live, it would bloat every recorded state
+    _unrecorded_attributes = frozenset({ATTR_MOVIES})
+
+    def __init__(self, coordinator: AllocineCoordinator, config_entry: MyConfigEntry) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, config_entry, "new_this_week")
+
+    def _compute(self, movies: list[AllocineMovie]) -> None:
+        """Set the number of movies released this week and list them."""
+        this_week = release_week(dt_util.now().date().isoformat())
+        new_movies = [
+            movie for movie in movies if release_week(movie.release_date) == this_week
+        ]
+
+        self._attr_native_value = len(new_movies)
+        self._attr_extra_state_attributes = {
+            ATTR_MOVIES: [
+                {ATTR_TITLE: movie.title, ATTR_POSTER: poster_url(movie)}
+                for movie in new_movies[:SENSOR_MAX_LIST_ITEMS]
+            ],
+        }
+
+
+class AllocineNextShowingSensor(CoordinatorEntity[ShowtimesCoordinator], SensorEntity):
+    """Next showing in the configured theaters."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "next_showing"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _unrecorded_attributes = frozenset({ATTR_VERSION})
+
+    def __init__(
+        self, coordinator: ShowtimesCoordinator, config_entry: MyConfigEntry
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{config_entry.entry_id}_next_showing"
+        self._attr_device_info = _device_info(config_entry)
+        self._unsub_next: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Compute the first value when added."""
+        await super().async_added_to_hass()
+        self._update_next_showing()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending switch to the following showing."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_next:
+            self._unsub_next()
+            self._unsub_next = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated showtimes."""
+        self._update_next_showing()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_showing_started(self, _now: datetime) -> None:
+        """Move on to the following showing once the current one started."""
+        self._unsub_next = None
+        self._update_next_showing()
+        self.async_write_ha_state()
+
+    @callback
+    def _update_next_showing(self) -> None:
+        """Look up the next showing in the index and schedule the following one."""
+        if self._unsub_next:
+            self._unsub_next()
+            self._unsub_next = None
+
+        # Strictly after now - the showing that just started is skipped
+        showing = None
+        if self.coordinator.data is not None:
+            showing = self.coordinator.data.next_showing(
+                dt_util.now() + timedelta(seconds=1)
+            )
+
+        if showing is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        self._attr_native_value = showing.starts_at
+        self._attr_extra_state_attributes = {
+            ATTR_TITLE: showing.movie_title,
+            ATTR_THEATER: showing.theater_id,
+            ATTR_VERSION: showing.version,
+        }
+        self._unsub_next = async_track_point_in_time(
+            self.hass, self._async_showing_started, showing.starts_at
+        )
@@ -4,9 +4,36 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.core import HomeAssistant, ServiceCall
-
-from .const import DOMAIN, SERVICE_REFRESH
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .browse import archive_poster_url, poster_url
+from .const import (
+    ATTR_LIMIT,
+    ATTR_QUERY,
+    DOMAIN,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT,
+    SERVICE_REFRESH,
+    SERVICE_SEARCH,
+)
+
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_QUERY): cv.string,
+        vol.Optional(ATTR_LIMIT, default=SEARCH_DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=SEARCH_MAX_LIMIT)
+        ),
+    }
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +56,14 @@ class AllocineServicesSetup:
             self.async_manual_refresh,
         )
 
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_SEARCH,
+            self.async_search,
+            schema=SEARCH_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
         _LOGGER.info("HAAllocine services registered")
 
     async def async_manual_refresh(self, service_call: ServiceCall) -> None:
@@ -48,3 +83,35 @@ class AllocineServicesSetup:
             await coordinator.async_request_refresh()
 
         _LOGGER.info("Manual refresh completed")
+
+    async def async_search(self, service_call: ServiceCall) -> ServiceResponse:
+        """Search current and archived releases by title or genre."""
+        query = service_call.data[ATTR_QUERY]
+        limit = service_call.data[ATTR_LIMIT]
+        _LOGGER.debug("Searching releases for '%s'", query)
+
+        if not (config_entries := self.hass.config_entries.async_loaded_entries(DOMAIN)):
+            raise ServiceValidationError("HAAllocine is not loaded")
+
+        coordinator = config_entries[0].runtime_data.coordinator
+        live_ids = {movie.id for movie in coordinator.data or []}
+
+        return {
+            "results": [
+                {
+                    "id": release.movie.id,
+                    "title": release.movie.title,
+                    "week": release.week,
+                    "rank": release.rank,
+                    "release_date": release.movie.release_date,
+                    "genres": release.movie.genres,
+                    "want_to_see_count": release.movie.want_to_see_count,
+                    # Posters of past weeks are only kept in the archive
+                    "poster": poster_url(release.movie)
+                    if release.movie.id in live_ids
+                    else archive_poster_url(release.week, release.movie.id),
+                    "placeholder": release.movie.placeholder,
+                }
+                for release in coordinator.search_index.search(query, limit)
+            ]
+        }
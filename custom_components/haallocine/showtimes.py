@@ -0,0 +1,153 @@
+"""Showtimes lookup for the configured Allocine theaters."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .allocine_api import AllocineAPI, AllocineShowtime
+from .const import DOMAIN, SHOWTIMES_CHECK_INTERVAL_MINUTES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ShowtimeIndex:
+    """Time-indexed showtimes of one day, by theater, by movie and by start time."""
+
+    def __init__(
+        self, day: date, showtimes: list[AllocineShowtime], complete: bool = True
+    ) -> None:
+        """Build the index (every bucket is kept sorted by start time)."""
+        self.day = day
+        self.complete = complete
+        self._all = sorted(showtimes, key=lambda s: s.starts_at)
+        self._by_theater: dict[str, list[AllocineShowtime]] = {}
+        self._by_movie: dict[str, list[AllocineShowtime]] = {}
+        self._by_pair: dict[tuple[str, str], list[AllocineShowtime]] = {}
+
+        for showtime in self._all:
+            self._by_theater.setdefault(showtime.theater_id, []).append(showtime)
+            self._by_movie.setdefault(showtime.movie_id, []).append(showtime)
+            self._by_pair.setdefault(
+                (showtime.theater_id, showtime.movie_id), []
+            ).append(showtime)
+
+    def __len__(self) -> int:
+        """Return the number of indexed showtimes."""
+        return len(self._all)
+
+    @property
+    def theaters(self) -> list[str]:
+        """Return the IDs of theaters having showtimes."""
+        return list(self._by_theater)
+
+    def movies_at(self, theater_id: str) -> dict[str, str]:
+        """Return the movies (ID to title) playing in a theater."""
+        return {
+            s.movie_id: s.movie_title for s in self._by_theater.get(theater_id, [])
+        }
+
+    def upcoming(
+        self,
+        after: datetime,
+        movie_id: str | None = None,
+        theater_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[AllocineShowtime]:
+        """Return showtimes starting at or after a time, optionally filtered."""
+        if movie_id is not None and theater_id is not None:
+            bucket = self._by_pair.get((theater_id, movie_id), [])
+        elif movie_id is not None:
+            bucket = self._by_movie.get(movie_id, [])
+        elif theater_id is not None:
+            bucket = self._by_theater.get(theater_id, [])
+        else:
+            bucket = self._all
+
+        start = bisect_left(bucket, after, key=lambda s: s.starts_at)
+        end = len(bucket) if limit is None else start + limit
+        return bucket[start:end]
+
+    def next_showing(
+        self,
+        after: datetime,
+        movie_id: str | None = None,
+        theater_id: str | None = None,
+    ) -> AllocineShowtime | None:
+        """Return the next showing at or after a time, optionally filtered."""
+        upcoming = self.upcoming(after, movie_id, theater_id, limit=1)
+        return upcoming[0] if upcoming else None
+
+
+class ShowtimesCoordinator(DataUpdateCoordinator[ShowtimeIndex]):
+    """Coordinator for the showtimes of the configured theaters, cached per day."""
+
+    data: ShowtimeIndex
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: AllocineAPI,
+        theaters: list[str],
+    ) -> None:
+        """Initialize coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} showtimes ({config_entry.unique_id})",
+            update_method=self.async_update_data,
+            update_interval=timedelta(minutes=SHOWTIMES_CHECK_INTERVAL_MINUTES),
+        )
+        self.api = api
+        self.theaters = theaters
+
+    async def async_update_data(self) -> ShowtimeIndex:
+        """Fetch today's showtimes of every theater, once per day."""
+        today = dt_util.now(AllocineAPI.TIMEZONE).date()
+
+        # Day has not changed - keep serving the index we already have
+        if self.data is not None and self.data.day == today and self.data.complete:
+            return self.data
+
+        _LOGGER.info(
+            "Fetching showtimes of %d theaters for %s", len(self.theaters), today
+        )
+
+        # Theaters are fetched concurrently, one executor job each
+        results = await asyncio.gather(
+            *(
+                self.hass.async_add_executor_job(
+                    self.api.fetch_theater_showtimes, theater_id, today
+                )
+                for theater_id in self.theaters
+            ),
+            return_exceptions=True,
+        )
+
+        showtimes: list[AllocineShowtime] = []
+        failures = 0
+        for theater_id, result in zip(self.theaters, results, strict=True):
+            if isinstance(result, BaseException):
+                # Don't fail the whole day for one theater
+                _LOGGER.warning(
+                    "Failed to fetch showtimes for theater %s: %s", theater_id, result
+                )
+                failures += 1
+                continue
+            showtimes.extend(result)
+
+        if self.theaters and failures == len(self.theaters):
+            raise UpdateFailed("Failed to fetch showtimes for every theater")
+
+        # A partial index is served but fetched again on the next check
+        index = ShowtimeIndex(today, showtimes, complete=failures == 0)
+        _LOGGER.info("Indexed %d showtimes for %s", len(index), today)
+        return index
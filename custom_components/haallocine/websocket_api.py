@@ -0,0 +1,132 @@
+"""Websocket API for HAAllocine release updates."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .allocine_api import AllocineMovie
+from .browse import poster_url
+from .const import DOMAIN, SIGNAL_UNLOADED
+from .coordinator import AllocineCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_releases)
+
+
+def _movie_payload(movie: AllocineMovie, rank: int, version: int) -> dict[str, Any]:
+    """Serialize a movie for websocket clients."""
+    return {
+        "id": movie.id,
+        "rank": rank,
+        "title": movie.title,
+        "release_date": movie.release_date,
+        "genres": movie.genres,
+        "want_to_see_count": movie.want_to_see_count,
+        # Versioned so clients refetch posters only when the data changed
+        "poster": f"{poster_url(movie)}?v={version}",
+        # Lets clients lay out and paint the poster before it loads
+        "placeholder": movie.placeholder,
+    }
+
+
+def _snapshot(coordinator: AllocineCoordinator) -> dict[str, dict[str, Any]]:
+    """Return the current movies by ID."""
+    version = coordinator.data_version
+    return {
+        movie.id: _movie_payload(movie, rank, version)
+        for rank, movie in enumerate(coordinator.data or [], 1)
+    }
+
+
+def _diff(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Return movies added, removed and re-ranked between two snapshots."""
+    return {
+        "added": [movie for movie_id, movie in current.items() if movie_id not in previous],
+        "removed": [movie_id for movie_id in previous if movie_id not in current],
+        "reranked": [
+            {"id": movie_id, "rank": movie["rank"]}
+            for movie_id, movie in current.items()
+            if movie_id in previous and previous[movie_id]["rank"] != movie["rank"]
+        ],
+    }
+
+
+@websocket_api.websocket_command({vol.Required("type"): "haallocine/releases/subscribe"})
+@callback
+def ws_subscribe_releases(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the current releases, then only what changes on each update."""
+    if not (config_entries := hass.config_entries.async_loaded_entries(DOMAIN)):
+        connection.send_error(msg["id"], "not_loaded", "HAAllocine is not loaded")
+        return
+
+    coordinator = config_entries[0].runtime_data.coordinator
+    version = coordinator.data_version
+    previous = _snapshot(coordinator)
+
+    @callback
+    def async_forward_changes() -> None:
+        """Push the delta since the last message sent to this client."""
+        nonlocal version, previous
+        # Listeners are also called after failed updates - nothing changed then
+        if coordinator.data_version == version:
+            return
+
+        current = _snapshot(coordinator)
+        delta = _diff(previous, current)
+        version, previous = coordinator.data_version, current
+
+        _LOGGER.debug(
+            "Pushing release delta v%d: %d added, %d removed, %d re-ranked",
+            version,
+            len(delta["added"]),
+            len(delta["removed"]),
+            len(delta["reranked"]),
+        )
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"type": "delta", "version": version, **delta}
+            )
+        )
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop forwarding changes."""
+        unsub_listener()
+        unsub_unloaded()
+
+    @callback
+    def async_close() -> None:
+        """End the subscription, a reloaded entry has a new coordinator."""
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        async_unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"type": "closed"})
+        )
+
+    unsub_listener = coordinator.async_add_listener(async_forward_changes)
+    unsub_unloaded = async_dispatcher_connect(hass, SIGNAL_UNLOADED, async_close)
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {"type": "snapshot", "version": version, "movies": list(previous.values())},
+        )
+    )
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""Load test for the HAAllocine poster view and media source.
+
+Starts Home Assistant with its http and media_source components and the
+integration, scraping a local stand-in for Allocine (releases page and
+posters). Dashboards fetching posters and media players browsing and casting
+them are simulated by concurrent clients while the releases are refreshed.
+
+Reports throughput, p50/p99 latency and errors per operation, and the lag of
+the Home Assistant event loop. Fails when any request errored, e.g. a poster
+of a current movie answered with a 404 while the cache was being rewritten.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+
+from aiohttp import ClientError, ClientSession, web
+
+from homeassistant import auth, bootstrap, loader
+from homeassistant.components import media_source
+from homeassistant.config_entries import ConfigEntries, ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+DOMAIN = "haallocine"
+
+GENRES = ["Action", "Animation", "Comédie", "Drame", "Horreur", "Science Fiction", "Thriller"]
+
+# Nodes a media player browses from, children are then picked at random
+BROWSE_ROOTS = ["", "week", "genre", "rank", "archive", "search/a"]
+BROWSE_DEPTH = 2
+
+LAG_INTERVAL = 0.05
+
+
+@dataclass
+class Stats:
+    """Latencies and errors of one operation."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    # 404s for movies dropped by a refresh while the request was in flight
+    stale: int = 0
+
+    def percentile(self, percent: float) -> float:
+        """Return a latency percentile, in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class AllocineStandIn:
+    """Local stand-in for the Allocine releases page and poster CDN."""
+
+    def __init__(self, movies: int, delay: float) -> None:
+        """Initialize stand-in serving a number of movies."""
+        self.movies = movies
+        self.delay = delay
+        self.generation = 0
+        self.base_url = ""
+        self.posters = {movie: self._render_poster(movie) for movie in range(movies)}
+        self._runner: web.AppRunner | None = None
+
+    @staticmethod
+    def _render_poster(movie: int) -> bytes:
+        """Render a poster-sized JPEG of its own color."""
+        from PIL import Image
+
+        rng = random.Random(movie)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        image = Image.new("RGB", (600, 800), color)
+        image.paste(tuple(255 - value for value in color), (100, 150, 500, 650))
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=85)
+        return output.getvalue()
+
+    async def async_start(self) -> str:
+        """Start serving, return the base URL."""
+        app = web.Application()
+        app.router.add_get("/film/sorties-semaine/", self._page)
+        app.router.add_get("/film/agenda/{week}/", self._page)
+        app.router.add_get("/posters/{movie}.jpg", self._poster)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        port = free_port()
+        await web.TCPSite(self._runner, "127.0.0.1", port).start()
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _page(self, request: web.Request) -> web.Response:
+        """Serve releases whose popularity changes on every scrape."""
+        await asyncio.sleep(self.delay)
+        self.generation += 1
+        rng = random.Random(self.generation)
+        today = date.today()
+        wednesday = today - timedelta(days=(today.weekday() - 2) % 7)
+
+        entities = {
+            f"entity{movie}": {
+                "id": f"{movie + 1000}",
+                "title": f"Film {movie}",
+                "poster": {"url": f"{self.base_url}/posters/{movie}.jpg"},
+                "releaseDate": wednesday.isoformat(),
+                "genres": [{"translate": GENRES[movie % len(GENRES)]}],
+                "social": {"user_note_i_want_to_see_count": rng.randrange(10_000)},
+            }
+            for movie in range(self.movies)
+        }
+        body = f"<html><script>var jsEntities = {json.dumps(entities)};</script></html>"
+        return web.Response(text=body, content_type="text/html")
+
+    async def _poster(self, request: web.Request) -> web.Response:
+        """Serve a poster."""
+        await asyncio.sleep(self.delay)
+        movie = int(request.match_info["movie"])
+        if movie not in self.posters:
+            raise web.HTTPNotFound
+        return web.Response(body=self.posters[movie], content_type="image/jpeg")
+
+
+class ExternalWorld:
+    """Event loop in its own thread, for the stand-in and the HTTP clients."""
+
+    def __init__(self) -> None:
+        """Start the loop."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def run(self, coro):
+        """Run a coroutine in the external loop, from another loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def stop(self) -> None:
+        """Stop the loop."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+async def poster_clients(
+    base_url: str, coordinator, clients: int, deadline: float, stats: Stats
+) -> None:
+    """Fetch posters of the current movies, like dashboards do."""
+
+    def current_ids() -> list[str]:
+        # Read from another thread, the data list is swapped as a whole
+        return [movie.id for movie in coordinator.data or []]
+
+    async def client(session: ClientSession) -> None:
+        while time.monotonic() < deadline:
+            if not (ids := current_ids()):
+                await asyncio.sleep(0.01)
+                continue
+            movie_id = random.choice(ids)
+
+            start = time.monotonic()
+            try:
+                async with session.get(
+                    f"{base_url}/api/haallocine/poster/{movie_id}.jpg"
+                ) as response:
+                    await response.read()
+                    status = response.status
+            except (ClientError, asyncio.TimeoutError) as err:
+                stats.errors[type(err).__name__] += 1
+                continue
+            stats.latencies.append(time.monotonic() - start)
+
+            if status == 404 and movie_id not in current_ids():
+                stats.stale += 1
+            elif status != 200:
+                stats.errors[f"HTTP {status}"] += 1
+
+    async with ClientSession() as session:
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+
+
+async def browse_clients(
+    hass: HomeAssistant,
+    clients: int,
+    pause: float,
+    deadline: float,
+    browse: Stats,
+    resolve: Stats,
+) -> None:
+    """Browse the media source and resolve posters, like media players do."""
+
+    async def timed(stats: Stats, coro):
+        start = time.monotonic()
+        try:
+            result = await coro
+        except Exception as err:  # noqa: BLE001
+            stats.errors[f"{type(err).__name__}: {err}"[:80]] += 1
+            return None
+        stats.latencies.append(time.monotonic() - start)
+        return result
+
+    async def client() -> None:
+        while time.monotonic() < deadline:
+            identifier = random.choice(BROWSE_ROOTS)
+            for _ in range(BROWSE_DEPTH):
+                node = await timed(
+                    browse,
+                    media_source.async_browse_media(
+                        hass, f"media-source://{DOMAIN}/{identifier}".rstrip("/")
+                    ),
+                )
+                if node is None or not (children := node.as_dict().get("children")):
+                    break
+                child = random.choice(children)
+                if child["can_play"]:
+                    await timed(
+                        resolve,
+                        media_source.async_resolve_media(hass, child["media_content_id"], None),
+                    )
+                    break
+                identifier = child["media_content_id"].removeprefix(f"media-source://{DOMAIN}/")
+            # Also yields when every call was answered from memory
+            await asyncio.sleep(pause)
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+
+
+async def refresher(coordinator, interval: float, deadline: float, stats: Stats) -> None:
+    """Refresh the releases periodically, rewriting the poster cache."""
+    while time.monotonic() + interval < deadline:
+        await asyncio.sleep(interval)
+        start = time.monotonic()
+        await coordinator.async_refresh()
+        stats.latencies.append(time.monotonic() - start)
+        if not coordinator.last_update_success:
+            stats.errors["UpdateFailed"] += 1
+
+
+async def lag_monitor(deadline: float, stats: Stats) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+        await asyncio.sleep(LAG_INTERVAL)
+        stats.latencies.append(max(0.0, time.monotonic() - start - LAG_INTERVAL))
+
+
+async def start_home_assistant(config_dir: Path, port: int) -> HomeAssistant:
+    """Start Home Assistant with the http and media_source components."""
+    # The integration is loaded from the config directory, as in a real install
+    os.symlink(Path(__file__).parent / "custom_components", config_dir / "custom_components")
+
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    # Registries and config entries, as loaded on a regular startup
+    await bootstrap.async_load_base_functionality(hass)
+    hass.auth = await auth.auth_manager_from_config(hass, [{"type": "homeassistant"}], [])
+
+    http_config = {"server_host": ["127.0.0.1"], "server_port": port}
+    if not await async_setup_component(hass, "http", {"http": http_config}):
+        raise RuntimeError("Failed to set up http")
+    if not await async_setup_component(hass, "media_source", {}):
+        raise RuntimeError("Failed to set up media_source")
+    return hass
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def print_stats(name: str, stats: Stats, duration: float) -> None:
+    """Print the line of an operation."""
+    errors = sum(stats.errors.values())
+    print(
+        f"  {name:<10} {len(stats.latencies):>7} {len(stats.latencies) / duration:>9.1f}"
+        f" {stats.percentile(50) * 1000:>9.1f} {stats.percentile(99) * 1000:>9.1f}"
+        f" {errors:>7} {stats.stale:>6}"
+    )
+    for error, count in stats.errors.most_common():
+        print(f"    {error}: {count}")
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the load test."""
+    # Imported once Home Assistant is importable from the repository
+    from custom_components.haallocine.allocine_api import AllocineAPI
+    from custom_components.haallocine.coordinator import AllocineCoordinator
+
+    config_dir = Path(tempfile.mkdtemp(prefix="allocine_load_"))
+    print(f"\nUsing config directory: {config_dir}")
+
+    world = ExternalWorld()
+    standin = AllocineStandIn(args.movies, args.allocine_delay)
+    base_url = await world.run(standin.async_start())
+    print(f"Allocine stand-in at {base_url} ({args.movies} movies)")
+
+    AllocineAPI.WEEKLY_URL = f"{base_url}/film/sorties-semaine/"
+    AllocineAPI.UPCOMING_URL = f"{base_url}/film/agenda/sem-{{week}}/"
+    AllocineCoordinator.CACHE_DIR = config_dir / "media"
+
+    port = args.port or free_port()
+    hass = await start_home_assistant(config_dir, port)
+
+    entry = ConfigEntry(
+        domain=DOMAIN,
+        title="Allocine",
+        data={},
+        options={},
+        source="user",
+        unique_id="load_test",
+        version=1,
+        minor_version=1,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_start()
+
+    if entry.state is not ConfigEntryState.LOADED:
+        print(f"\n✗ Integration failed to load: {entry.state}")
+        await hass.async_stop()
+        world.stop()
+        return 1
+
+    coordinator = entry.runtime_data.coordinator
+    print(f"Home Assistant at http://127.0.0.1:{port}, {len(coordinator.data)} movies loaded")
+    print(
+        f"\nRunning {args.duration}s: {args.poster_clients} poster clients,"
+        f" {args.browse_clients} browse clients, refresh every {args.refresh_interval}s"
+    )
+
+    posters, browse, resolve, refresh, lag = Stats(), Stats(), Stats(), Stats(), Stats()
+    deadline = time.monotonic() + args.duration
+    start = time.monotonic()
+    await asyncio.gather(
+        world.run(
+            poster_clients(
+                f"http://127.0.0.1:{port}", coordinator, args.poster_clients, deadline, posters
+            )
+        ),
+        browse_clients(
+            hass, args.browse_clients, args.browse_pause, deadline, browse, resolve
+        ),
+        refresher(coordinator, args.refresh_interval, deadline, refresh),
+        lag_monitor(deadline, lag),
+    )
+    duration = time.monotonic() - start
+
+    await hass.async_stop()
+    await world.run(standin.async_stop())
+    world.stop()
+
+    print("\n" + "=" * 60)
+    print("Results")
+    print("=" * 60)
+    print(f"  {'operation':<10} {'count':>7} {'per sec':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'stale':>6}")
+    print_stats("poster", posters, duration)
+    print_stats("browse", browse, duration)
+    print_stats("resolve", resolve, duration)
+    print_stats("refresh", refresh, duration)
+    print(
+        f"\n  Event loop lag: p50 {lag.percentile(50) * 1000:.1f} ms,"
+        f" p99 {lag.percentile(99) * 1000:.1f} ms,"
+        f" max {max(lag.latencies, default=0) * 1000:.1f} ms"
+    )
+
+    errors = sum(
+        sum(stats.errors.values()) for stats in (posters, browse, resolve, refresh)
+    )
+    if errors:
+        print(f"\n✗ {errors} requests failed")
+        return 1
+
+    print("\n✓ No errors under load")
+    return 0
+
+
+def main():
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load")
+    parser.add_argument("--poster-clients", type=int, default=50)
+    parser.add_argument("--browse-clients", type=int, default=10)
+    parser.add_argument(
+        "--browse-pause", type=float, default=0.01, help="seconds between browse sessions"
+    )
+    parser.add_argument("--refresh-interval", type=float, default=5, help="seconds")
+    parser.add_argument("--movies", type=int, default=30, help="movies on the stand-in page")
+    parser.add_argument(
+        "--allocine-delay", type=float, default=0.2, help="stand-in response delay (seconds)"
+    )
+    parser.add_argument("--port", type=int, default=0, help="Home Assistant port (random)")
+    parser.add_argument("--verbose", action="store_true", help="log integration activity")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    print("=" * 60)
+    print("Load testing HAAllocine")
+    print("=" * 60)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
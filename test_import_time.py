@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Import-time budget check for the HAAllocine integration.
+
+Runs `python -X importtime` on the integration modules Home Assistant loads at
+startup and fails when they take longer than the budget, or when they pull in a
+dependency that should only be imported on first use.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules Home Assistant has already imported when it loads the integration
+PRELOADED = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.http",
+    "homeassistant.components.media_player",
+    "homeassistant.components.media_source",
+    "homeassistant.components.websocket_api",
+]
+
+# Integration modules loaded at startup
+INTEGRATION = [
+    "custom_components.haallocine",
+    "custom_components.haallocine.config_flow",
+    "custom_components.haallocine.media_source",
+]
+
+# Heavy dependencies that must only be imported on first use. requests is not
+# one of them, Home Assistant already imports it before loading the integration
+DEFERRED = ["bs4", "PIL"]
+
+# Cumulative import time allowed for the integration (microseconds)
+BUDGET_US = 50_000
+
+RUNS = 5
+
+
+def measure() -> tuple[int, set[str], set[str]]:
+    """Import the integration once, return its import time, what it and Home Assistant imported."""
+    code = "; ".join(f"import {module}" for module in PRELOADED + INTEGRATION)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Lines look like: "import time:       self [us] |  cumulative | imported package"
+    # Nested imports are indented and printed before the module importing them
+    total = 0
+    imported: set[str] = set()
+    preloaded: set[str] = set()
+    nested: list[str] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        if name.startswith("  "):
+            nested.append(name.strip())
+            continue
+
+        name = name.strip()
+        if name in INTEGRATION:
+            total += int(cumulative)
+            imported.update(nested)
+        else:
+            preloaded.update(nested)
+            preloaded.add(name)
+        nested = []
+
+    if not total:
+        raise RuntimeError("Integration modules were not imported")
+
+    return total, imported, preloaded
+
+
+def main():
+    """Check the integration import time against the budget."""
+    print("=" * 60)
+    print("Measuring HAAllocine import time")
+    print("=" * 60)
+
+    timings = []
+    imported: set[str] = set()
+    preloaded: set[str] = set()
+    for run in range(1, RUNS + 1):
+        total, imported, preloaded = measure()
+        timings.append(total)
+        print(f"  Run {run}: {total / 1000:.1f} ms")
+
+    best = min(timings)
+    print(f"\nBest of {RUNS}:   {best / 1000:.1f} ms (budget {BUDGET_US / 1000:.1f} ms)")
+
+    failed = False
+
+    # A dependency Home Assistant already imported can't be caught being imported
+    unchecked = sorted(dep for dep in DEFERRED if dep in preloaded)
+    if unchecked:
+        print(f"\n✗ Deferred dependencies already imported by Home Assistant: {', '.join(unchecked)}")
+        failed = True
+
+    eager = sorted(
+        module
+        for module in imported
+        if any(module == dep or module.startswith(f"{dep}.") for dep in DEFERRED)
+    )
+    if eager:
+        print(f"\n✗ Deferred dependencies imported at startup: {', '.join(eager)}")
+        failed = True
+
+    if best > BUDGET_US:
+        print("\n✗ Import time over budget")
+        failed = True
+
+    if failed:
+        return 1
+
+    print("\n✓ Import time within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Standalone test script for the HAAllocine search index."""
+
+import sys
+
+from custom_components.haallocine.allocine_api import AllocineMovie
+from custom_components.haallocine.archive import ArchivedRelease
+from custom_components.haallocine.search import SearchIndex, normalize, tokenize
+
+
+def release(week, movie_id, title, genres=(), want_to_see=0):
+    """Build an archived release."""
+    return ArchivedRelease(
+        week=week,
+        rank=1,
+        movie=AllocineMovie(
+            id=movie_id,
+            title=title,
+            poster_url="",
+            release_date=week,
+            want_to_see_count=want_to_see,
+            genres=list(genres),
+        ),
+    )
+
+
+def ids(results):
+    """Return the movie IDs of search results."""
+    return [result.movie.id for result in results]
+
+
+def main():
+    """Test normalization and the search index."""
+    print("=" * 60)
+    print("Testing search index")
+    print("=" * 60)
+
+    failures = []
+
+    def check(name, actual, expected):
+        status = "✓" if actual == expected else "✗"
+        print(f"  {status} {name}: {actual!r}")
+        if actual != expected:
+            print(f"      expected {expected!r}")
+            failures.append(name)
+
+    print("\n1. Normalization")
+    check("accents", normalize("Comédie Dramatique"), "comedie dramatique")
+    check("oe ligature", tokenize("Le Cœur des hommes"), ["le", "coeur", "des", "hommes"])
+    check("uppercase ligature", tokenize("L'Œuvre"), ["l", "oeuvre"])
+    check("ae ligature", tokenize("Ægypte"), ["aegypte"])
+    check("punctuation", tokenize("Mission: Impossible - 2"), ["mission", "impossible", "2"])
+
+    index = SearchIndex()
+    index.add_many(
+        [
+            release("2026-10-07", "1", "Le Cœur des hommes", ["Comédie"], 300),
+            release("2026-10-07", "2", "L'Œuvre", ["Drame"], 100),
+            release("2026-10-14", "3", "Cœurs brisés", ["Drame", "Romance"], 200),
+            release("2026-10-14", "4", "Dune", ["Science Fiction"], 900),
+        ]
+    )
+
+    print("\n2. Prefix lookup")
+    check("folded query", ids(index.search("oeuvre")), ["2"])
+    check("prefix, ranked by popularity", ids(index.search("coe")), ["1", "3"])
+    check("ligature in query", ids(index.search("Œuvre")), ["2"])
+    check("genre", ids(index.search("drame")), ["3", "2"])
+    check("every token must match", ids(index.search("coeur comedie")), ["1"])
+    check("no release has every token", ids(index.search("oeuvre comedie")), [])
+    check("title and genre", ids(index.search("coeurs dra")), ["3"])
+    check("limit", ids(index.search("d", limit=2)), ["4", "1"])
+    check("empty query", ids(index.search("  ")), [])
+
+    print("\n3. replace_week")
+    index.replace_week(
+        "2026-10-14",
+        [
+            release("2026-10-14", "4", "Dune", ["Science Fiction"], 950),
+            release("2026-10-14", "5", "Cœur de pierre", ["Thriller"], 50),
+        ],
+    )
+    check("removed release", ids(index.search("brises")), [])
+    check("added release", ids(index.search("pierre")), ["5"])
+    check("updated release", [r.movie.want_to_see_count for r in index.search("dune")], [950])
+    check("other weeks untouched", ids(index.search("coeur")), ["1", "5"])
+    check("dropped tokens", ids(index.search("romance")), [])
+    check("size", len(index), 4)
+
+    print("\n4. remove_weeks")
+    index.remove_weeks(["2026-10-07", "2026-09-30"])
+    check("weeks", index.weeks, ["2026-10-14"])
+    check("removed week", ids(index.search("oeuvre")), [])
+    check("kept week", ids(index.search("coeur")), ["5"])
+    check("size", len(index), 2)
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"✗ {len(failures)} checks failed: {', '.join(failures)}")
+        return 1
+
+    print("✓ All search checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())